@@ -1,17 +1,23 @@
+_WEIGHTS = (
+    ("name", 0.05),
+    ("url", 0.05),
+    ("sameAs", 0.05),
+    ("logo", 0.03),
+)
+
+
 def enrich_confidence(entity, source_count: int = 1):
-    score = entity.confidence
     props = entity.properties
 
-    if props.get("name"):
-        score += 0.05
-    if props.get("url"):
-        score += 0.05
-    if props.get("sameAs"):
-        score += 0.05
-    if props.get("logo"):
-        score += 0.03
+    score = (
+        entity.confidence
+        + sum(w for k, w in _WEIGHTS if props.get(k))
+        + (0.1 if source_count > 1 else 0.0)
+    )
+
+    entity.confidence = round(score if score < 1.0 else 1.0, 2)
 
-    if source_count > 1:
-        score += 0.1
 
-    entity.confidence = round(min(score, 1.0), 2)
+def enrich_confidence_batch(entities, source_count: int = 1):
+    for entity in entities:
+        enrich_confidence(entity, source_count)
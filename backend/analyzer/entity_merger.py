@@ -1,30 +1,34 @@
-from collections import defaultdict
+def merge_entities(entities):
+    primaries = {}
+    sources = {}
+    counts = {}
 
-def _identity_key(entity):
-    props = entity.properties
-    return (
-        entity.type,
-        props.get("name", "").lower(),
-        props.get("url", "").lower()
-    )
+    # single pass: keep highest-confidence entity per key
+    for e in entities:
+        key = e._identity_key
+        current = primaries.get(key)
 
+        if current is None:
+            primaries[key] = e
+            sources[key] = {e.source}
+            counts[key] = 1
+            continue
 
-def merge_entities(entities):
-    buckets = defaultdict(list)
+        if e.confidence > current.confidence:
+            primaries[key] = e
 
-    for e in entities:
-        buckets[_identity_key(e)].append(e)
+        sources[key].add(e.source)
+        counts[key] += 1
 
     merged = []
 
-    for _, group in buckets.items():
-        primary = max(group, key=lambda x: x.confidence)
+    for key, primary in primaries.items():
 
         # merge sources
-        primary.source = ",".join(sorted(set(e.source for e in group)))
+        primary.source = ",".join(sorted(sources[key]))
 
         # confidence boost for multi-source
-        if len(group) > 1:
+        if counts[key] > 1:
             primary.confidence = min(primary.confidence + 0.1, 1.0)
 
         merged.append(primary)
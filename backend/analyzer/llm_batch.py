@@ -0,0 +1,212 @@
+import os
+import io
+import orjson
+import logging
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+
+from backend.analyzer.openai_client import get_openai_client
+from backend.analyzer.llm_schema_generator import (
+    build_schema_prompt,
+    build_schema_request_body,
+    is_valid_schema
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_ENDPOINT = "/v1/chat/completions"
+BATCH_COMPLETION_WINDOW = "24h"
+
+# Opt-in: bulk/offline runs only. Interactive requests stay on the live API.
+BATCH_MODE_ENABLED = os.getenv("LLM_BATCH_MODE", "").lower() in ("1", "true", "yes")
+
+BATCH_TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+
+
+def _failed(schema_name: str) -> Dict[str, Any]:
+    # same shape as the live path's failure result
+    return {"error": "Schema generation failed", "schema_requested": schema_name}
+
+
+# --------------------------------------------------
+# REQUEST MODEL
+# --------------------------------------------------
+
+@dataclass
+class BatchRequest:
+    custom_id: str
+    body: Dict[str, Any]
+
+    def to_jsonl(self) -> str:
+        return orjson.dumps({
+            "custom_id": self.custom_id,
+            "method": "POST",
+            "url": BATCH_ENDPOINT,
+            "body": self.body
+        }).decode()
+
+
+def build_schema_batch_request(
+    custom_id: str,
+    schema_name: str,
+    entities: Dict[str, Any],
+    signals: Dict[str, Any],
+    url: Optional[str]
+) -> BatchRequest:
+
+    prompt = build_schema_prompt(schema_name, entities, signals, url)
+
+    return BatchRequest(
+        custom_id=custom_id,
+        body=build_schema_request_body(prompt)
+    )
+
+
+# --------------------------------------------------
+# SUBMIT
+# --------------------------------------------------
+
+async def submit_batch(requests: List[BatchRequest]) -> str:
+    """
+    Upload requests as JSONL and create a batch job.
+    Returns the batch id.
+    """
+
+    client = get_openai_client()
+
+    payload = "\n".join(r.to_jsonl() for r in requests).encode("utf-8")
+
+    uploaded = await client.files.create(
+        file=("batch.jsonl", io.BytesIO(payload)),
+        purpose="batch"
+    )
+
+    batch = await client.batches.create(
+        input_file_id=uploaded.id,
+        endpoint=BATCH_ENDPOINT,
+        completion_window=BATCH_COMPLETION_WINDOW
+    )
+
+    logger.info(f"📦 Submitted batch {batch.id} ({len(requests)} requests)")
+
+    return batch.id
+
+
+# --------------------------------------------------
+# COLLECT
+# --------------------------------------------------
+
+async def _submitted_ids(batch) -> List[str]:
+    """
+    custom_ids of the batch input file (needed when there is no output).
+    """
+
+    client = get_openai_client()
+
+    content = await client.files.content(batch.input_file_id)
+
+    return [
+        orjson.loads(line)["custom_id"]
+        for line in content.text.splitlines()
+        if line.strip()
+    ]
+
+
+async def collect_results(
+    batch,
+    schema_names: Dict[str, str]
+) -> Dict[str, Dict]:
+    """
+    Map parsed schemas by custom_id (`schema_names`: custom_id -> schema).
+    Every submitted custom_id gets an entry: failed / invalid / missing
+    lines, or a batch without output, map to the live path's error shape.
+    """
+
+    results: Dict[str, Dict] = {
+        custom_id: _failed(name) for custom_id, name in schema_names.items()
+    }
+
+    if batch.status != "completed" or not batch.output_file_id:
+        logger.warning(f"Batch {batch.id} has no output ({batch.status})")
+        return results
+
+    client = get_openai_client()
+
+    content = await client.files.content(batch.output_file_id)
+
+    for line in content.text.splitlines():
+
+        if not line.strip():
+            continue
+
+        record = orjson.loads(line)
+        custom_id = record.get("custom_id")
+
+        if custom_id not in schema_names:
+            continue
+
+        try:
+            body = record["response"]["body"]
+            text = body["choices"][0]["message"]["content"].strip()
+            schema_json = orjson.loads(text)
+
+            if not is_valid_schema(schema_json):
+                raise ValueError("Hallucinated schema")
+
+            results[custom_id] = schema_json
+
+        except Exception as e:
+            logger.warning(f"Batch result {custom_id} rejected: {e}")
+
+    return results
+
+
+# --------------------------------------------------
+# SCHEMA JOBS
+# --------------------------------------------------
+
+async def submit_schema_batch(
+    schema_names: List[str],
+    entities: Dict[str, Any],
+    signals: Dict[str, Any],
+    url: Optional[str]
+) -> str:
+    """
+    Queue one request per schema; returns the batch id to poll with
+    get_schema_batch. Never waits for the batch itself.
+    """
+
+    # positional prefix: the same schema may be requested twice
+    requests = [
+        build_schema_batch_request(f"{i}:{name}", name, entities, signals, url)
+        for i, name in enumerate(schema_names)
+    ]
+
+    return await submit_batch(requests)
+
+
+async def get_schema_batch(batch_id: str) -> Dict[str, Any]:
+    """
+    Single status check. Once the batch is terminal, `results` holds one
+    entry per submitted schema, in submission order.
+    """
+
+    client = get_openai_client()
+
+    batch = await client.batches.retrieve(batch_id)
+
+    if batch.status not in BATCH_TERMINAL_STATES:
+        return {"batch_id": batch_id, "status": batch.status}
+
+    custom_ids = await _submitted_ids(batch)
+
+    results = await collect_results(
+        batch,
+        {custom_id: custom_id.split(":", 1)[1] for custom_id in custom_ids}
+    )
+
+    return {
+        "batch_id": batch_id,
+        "status": batch.status,
+        "results": [results[custom_id] for custom_id in custom_ids]
+    }
@@ -0,0 +1,56 @@
+import os
+import hashlib
+import logging
+from typing import Any, Optional
+
+import diskcache
+import orjson
+
+logger = logging.getLogger(__name__)
+
+LLM_CACHE_DIR = os.getenv("LLM_CACHE_DIR", "/tmp/llm_cache")
+LLM_CACHE_SIZE_LIMIT = 2 ** 30          # 1 GiB
+LLM_CACHE_TTL = 7 * 24 * 3600           # seconds
+
+_cache: Optional[diskcache.Cache] = None
+
+
+# --------------------------------------------------
+# CACHE (Singleton, shared across workers on disk)
+# --------------------------------------------------
+
+def _get_cache() -> diskcache.Cache:
+    global _cache
+
+    if _cache is None:
+        _cache = diskcache.Cache(LLM_CACHE_DIR, size_limit=LLM_CACHE_SIZE_LIMIT)
+
+    return _cache
+
+
+def cache_key(model: str, prompt: str) -> str:
+    """
+    The rendered prompt already encodes url + entities + signals (+ schema).
+    """
+    return hashlib.blake2b(
+        orjson.dumps({"m": model, "p": prompt})
+    ).hexdigest()
+
+
+# --------------------------------------------------
+# SAFE ACCESSORS — a cache failure never breaks a request
+# --------------------------------------------------
+
+def cache_get(key: str) -> Optional[Any]:
+    try:
+        return _get_cache().get(key)
+    except Exception as e:
+        logger.warning(f"LLM cache read failed: {e}")
+        return None
+
+
+def cache_set(key: str, value: Any) -> None:
+    try:
+        _get_cache().set(key, value, expire=LLM_CACHE_TTL)
+    except Exception as e:
+        logger.warning(f"LLM cache write failed: {e}")
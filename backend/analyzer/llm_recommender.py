@@ -1,19 +1,21 @@
 import logging
 import json
-import os
-from typing import Dict, List, Optional, Set
-from dotenv import load_dotenv
+import orjson
+from typing import Dict, FrozenSet, List, Optional, Set
 from openai import AsyncOpenAI
 
-from backend.analyzer.schemaorg_loader import load_schemaorg_ontology
-from backend.analyzer.type_resolver import is_subclass
-
-load_dotenv()
+from backend.analyzer.openai_client import get_openai_client
+from backend.analyzer.llm_cache import cache_get, cache_key, cache_set
+from backend.analyzer.schemaorg_loader import (
+    get_all_schema_types,
+    get_ancestors,
+    get_descendants
+)
+from backend.utils.serialization import dumps_truncated
 
 logger = logging.getLogger(__name__)
 
-_client: Optional[AsyncOpenAI] = None
-_SCHEMA_TYPES: Optional[Set[str]] = None
+INTENT_MODEL = "gpt-4o-mini"
 
 
 # --------------------------------------------------
@@ -32,42 +34,15 @@ EMPTY_LLM_RESPONSE: Dict[str, List[str]] = {
 # --------------------------------------------------
 
 def _get_client() -> AsyncOpenAI:
-    global _client
-
-    if _client is None:
-
-        api_key = os.getenv("OPENAI_API_KEY")
-
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY not set")
-
-        _client = AsyncOpenAI(api_key=api_key)
-
-    return _client
+    return get_openai_client()
 
 
 # --------------------------------------------------
 # LOAD SCHEMA TYPES (Cached)
 # --------------------------------------------------
 
-def _get_all_schema_types() -> Set[str]:
-
-    global _SCHEMA_TYPES
-
-    if _SCHEMA_TYPES is None:
-
-        graph = load_schemaorg_ontology()
-
-        all_types = set(graph.keys())
-
-        for children in graph.values():
-            all_types.update(children)
-
-        _SCHEMA_TYPES = all_types
-
-        logger.info(f"✅ Loaded {len(_SCHEMA_TYPES)} schema.org types")
-
-    return _SCHEMA_TYPES
+def _get_all_schema_types() -> FrozenSet[str]:
+    return get_all_schema_types()
 
 
 # --------------------------------------------------
@@ -79,7 +54,7 @@ async def _call_llm(prompt: str) -> str:
     client = _get_client()
 
     response = await client.chat.completions.create(
-        model="gpt-4o-mini",
+        model=INTENT_MODEL,
         temperature=0.0,
         messages=[
             {
@@ -108,24 +83,15 @@ async def _call_llm(prompt: str) -> str:
 # PROMPT
 # --------------------------------------------------
 
-def _build_prompt(
-    url: str,
-    entities: Dict,
-    signals: Dict
-) -> str:
-
-    entities_str = json.dumps(entities)[:3500]
-    signals_str = json.dumps(signals)[:3500]
-
-    return f"""
+_PROMPT_TMPL = """
 URL:
 {url}
 
 Detected Entities:
-{entities_str}
+{entities}
 
 SEO Signals:
-{signals_str}
+{signals}
 
 TASK:
 Infer the TRUE search intent of this page and recommend ONLY schema.org types that are NOT already present.
@@ -147,6 +113,22 @@ FORMAT:
 """
 
 
+def _build_prompt(
+    url: str,
+    entities: Dict,
+    signals: Dict
+) -> str:
+
+    entities_str = dumps_truncated(entities, 3500)
+    signals_str = dumps_truncated(signals, 3500)
+
+    return _PROMPT_TMPL.format_map({
+        "url": url,
+        "entities": entities_str,
+        "signals": signals_str
+    })
+
+
 # --------------------------------------------------
 # NORMALIZATION
 # --------------------------------------------------
@@ -167,6 +149,7 @@ def _filter_valid_schemas(
 ) -> List[str]:
 
     valid_types = _get_all_schema_types()
+    existing_set = frozenset(existing_types)
 
     cleaned = []
 
@@ -177,14 +160,14 @@ def _filter_valid_schemas(
         if schema not in valid_types:
             continue
 
-        if schema in existing_types:
+        if schema in existing_set:
+            continue
+
+        # skip anything above or below an existing type in the hierarchy
+        if not existing_set.isdisjoint(get_ancestors(schema)):
             continue
 
-        if any(
-            is_subclass(schema, existing)
-            or is_subclass(existing, schema)
-            for existing in existing_types
-        ):
+        if not existing_set.isdisjoint(get_descendants(schema)):
             continue
 
         cleaned.append(schema)
@@ -208,6 +191,13 @@ async def infer_page_intent(
 
     prompt = _build_prompt(url, entities or {}, signals or {})
 
+    key = cache_key(INTENT_MODEL, prompt)
+    cached = cache_get(key)
+
+    if cached is not None:
+        logger.info("🧠 LLM intent served from cache")
+        return cached
+
     try:
 
         logger.info("🧠 Running LLM semantic intent analysis...")
@@ -217,7 +207,7 @@ async def infer_page_intent(
         logger.info("====== RAW LLM RESPONSE ======")
         logger.info(response_text)
 
-        parsed = json.loads(response_text or "{}")
+        parsed = orjson.loads(response_text) if response_text else {}
 
         if not isinstance(parsed, dict):
             return EMPTY_LLM_RESPONSE
@@ -243,9 +233,12 @@ async def infer_page_intent(
         logger.info("====== CLEANED LLM SUGGESTIONS ======")
         logger.info(json.dumps(cleaned, indent=2))
 
+        if cleaned:
+            cache_set(key, cleaned)
+
         return cleaned or EMPTY_LLM_RESPONSE
 
-    except json.JSONDecodeError:
+    except orjson.JSONDecodeError:
         logger.warning("LLM returned INVALID JSON")
         return EMPTY_LLM_RESPONSE
 
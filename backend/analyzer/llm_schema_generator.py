@@ -1,39 +1,43 @@
-import os
-import json
+import orjson
 import logging
 import asyncio
-from typing import Dict, Any, Optional
-from dotenv import load_dotenv
-from openai import AsyncOpenAI
+import random
+from typing import Dict, Any, List, Optional
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    InternalServerError,
+    RateLimitError
+)
+
+from backend.analyzer.openai_client import get_openai_client
+from backend.analyzer.llm_cache import cache_get, cache_key, cache_set
+from backend.analyzer.schemaorg_loader import get_all_schema_types
+from backend.utils.serialization import dumps_truncated
 
-from backend.analyzer.schemaorg_loader import load_schemaorg_ontology
-
-load_dotenv()
 logger = logging.getLogger(__name__)
 
-_client: Optional[AsyncOpenAI] = None
+SCHEMA_MODEL = "gpt-4o-mini"
+RATE_LIMIT_RETRIES = 4
+
+# Failures worth a second attempt: bad JSON / hallucinated type / transient
+# API error. 429 is handled by _create_with_backoff; other 4xx won't recover.
+_RETRYABLE_ERRORS = (
+    orjson.JSONDecodeError,
+    ValueError,
+    APIConnectionError,
+    APITimeoutError,
+    InternalServerError
+)
 
 
 # --------------------------------------------------
 # CLIENT SINGLETON
 # --------------------------------------------------
 
-def get_client():
-    global _client
-
-    if _client is None:
-
-        api_key = os.getenv("OPENAI_API_KEY")
-
-        if not api_key:
-            raise RuntimeError("OPENAI_API_KEY not set")
-
-        _client = AsyncOpenAI(
-            api_key=api_key,
-            timeout=40.0   # ⭐ prevents hanging
-        )
-
-    return _client
+def get_client() -> AsyncOpenAI:
+    return get_openai_client()
 
 
 # --------------------------------------------------
@@ -45,50 +49,34 @@ def is_valid_schema(schema_json: Dict) -> bool:
     Prevent hallucinated schema types.
     """
 
-    schema_graph = load_schemaorg_ontology()
-
-    schema_type = schema_json.get("@type")
-
-    if not schema_type:
+    if not isinstance(schema_json, dict):
         return False
 
-    # flatten ontology
-    all_types = set(schema_graph.keys())
-    for children in schema_graph.values():
-        all_types.update(children)
+    schema_type = schema_json.get("@type")
 
-    return schema_type in all_types
+    return isinstance(schema_type, str) and schema_type in get_all_schema_types()
 
 
 # --------------------------------------------------
-# GENERATOR
+# PROMPT
 # --------------------------------------------------
 
-async def generate_schema_ai(
-    schema_name: str,
-    entities: Dict[str, Any],
-    signals: Dict[str, Any],
-    url: Optional[str]
-) -> Dict:
-
-    client = get_client()
-
-    prompt = f"""
+_SCHEMA_PROMPT_TMPL = """
 You are a world-class technical SEO engineer.
 
 Generate a VALID schema.org JSON-LD.
 
 TARGET SCHEMA:
-{schema_name}
+{schema}
 
 PAGE URL:
 {url}
 
 DETECTED ENTITIES:
-{json.dumps(entities)[:3500]}
+{entities}
 
 SEO SIGNALS:
-{json.dumps(signals)[:1500]}
+{signals}
 
 RULES:
 
@@ -102,48 +90,181 @@ RULES:
 - No comments
 """
 
+
+def build_schema_prompt(
+    schema_name: str,
+    entities: Dict[str, Any],
+    signals: Dict[str, Any],
+    url: Optional[str]
+) -> str:
+
+    return _render_schema_prompt(
+        schema_name,
+        dumps_truncated(entities, 3500),
+        dumps_truncated(signals, 1500),
+        url
+    )
+
+
+def _render_schema_prompt(
+    schema_name: str,
+    entities_json: str,
+    signals_json: str,
+    url: Optional[str]
+) -> str:
+
+    return _SCHEMA_PROMPT_TMPL.format_map({
+        "schema": schema_name,
+        "url": url,
+        "entities": entities_json,
+        "signals": signals_json
+    })
+
+
+def build_schema_request_body(prompt: str) -> Dict[str, Any]:
+    """
+    Chat-completions body shared by the live and batch paths.
+    """
+
+    return {
+        "model": SCHEMA_MODEL,
+        "temperature": 0,
+        "response_format": {"type": "json_object"},
+        "messages": [
+            {"role": "system", "content": "Return ONLY JSON."},
+            {"role": "user", "content": prompt}
+        ]
+    }
+
+
+# --------------------------------------------------
+# RATE-LIMIT BACKOFF
+# --------------------------------------------------
+
+async def _create_with_backoff(client: AsyncOpenAI, **kwargs):
+    """
+    Exponential backoff (with jitter) on 429s only.
+    """
+
+    for retry in range(RATE_LIMIT_RETRIES):
+        try:
+            return await client.chat.completions.create(**kwargs)
+
+        except RateLimitError:
+            delay = 2 ** retry + random.random()
+            logger.warning(f"Rate limited, retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+
+    return await client.chat.completions.create(**kwargs)
+
+
+# --------------------------------------------------
+# GENERATOR
+# --------------------------------------------------
+
+async def generate_schema_ai(
+    schema_name: str,
+    entities: Dict[str, Any],
+    signals: Dict[str, Any],
+    url: Optional[str]
+) -> Dict:
+
+    prompt = build_schema_prompt(schema_name, entities, signals, url)
+
+    return await _generate_from_prompt(schema_name, prompt)
+
+
+async def _generate_from_prompt(schema_name: str, prompt: str) -> Dict:
+
+    key = cache_key(SCHEMA_MODEL, prompt)
+    cached = cache_get(key)
+
+    if cached is not None:
+        logger.info(f"Schema {schema_name} served from cache")
+        return cached
+
+    client = get_client()
+    text = None
+
     for attempt in range(2):
 
         try:
 
-            response = await client.chat.completions.create(
-                model="gpt-4o-mini",
-                temperature=0,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": "Return ONLY JSON."},
-                    {"role": "user", "content": prompt}
-                ]
+            response = await _create_with_backoff(
+                client,
+                **build_schema_request_body(prompt)
             )
 
-            text = response.choices[0].message.content.strip()
+            text = (response.choices[0].message.content or "").strip()
 
-            schema_json = json.loads(text)
+            schema_json = orjson.loads(text)
 
             # ⭐ ontology validation
             if not is_valid_schema(schema_json):
 
-                logger.warning(
-                    f"Invalid schema type generated: {schema_json.get('@type')}"
+                schema_type = (
+                    schema_json.get("@type")
+                    if isinstance(schema_json, dict) else None
                 )
 
+                logger.warning(f"Invalid schema type generated: {schema_type}")
+
                 raise ValueError("Hallucinated schema")
 
-            return schema_json
+            cache_set(key, schema_json)
 
+            return schema_json
 
-        except Exception as e:
+        except _RETRYABLE_ERRORS as e:
 
             logger.warning(f"Schema generation failed (attempt {attempt+1})")
             logger.warning(str(e))
 
             if attempt == 1:
                 logger.error("LLM RAW OUTPUT:")
-                logger.error(text if 'text' in locals() else "No output")
-
-                return {
-                    "error": "Schema generation failed",
-                    "schema_requested": schema_name
-                }
+                logger.error(text or "No output")
+                break
 
             await asyncio.sleep(1)  # small retry delay
+
+        except Exception:
+            logger.exception("Schema generation failed (not retried)")
+            break
+
+    return {
+        "error": "Schema generation failed",
+        "schema_requested": schema_name
+    }
+
+
+# --------------------------------------------------
+# PARALLEL GENERATOR
+# --------------------------------------------------
+
+async def generate_schemas_ai(
+    schema_names: List[str],
+    entities: Dict[str, Any],
+    signals: Dict[str, Any],
+    url: Optional[str],
+    max_concurrency: int = 8
+) -> List[Any]:
+    """
+    Fan out one generation per schema, bounded by a semaphore.
+    Results are returned in input order.
+    """
+
+    sem = asyncio.Semaphore(max_concurrency)
+
+    # same page for every schema: serialize context once
+    entities_json = dumps_truncated(entities, 3500)
+    signals_json = dumps_truncated(signals, 1500)
+
+    async def worker(name: str) -> Dict:
+        prompt = _render_schema_prompt(name, entities_json, signals_json, url)
+        async with sem:
+            return await _generate_from_prompt(name, prompt)
+
+    return await asyncio.gather(
+        *(worker(n) for n in schema_names),
+        return_exceptions=True
+    )
@@ -0,0 +1,96 @@
+import os
+import asyncio
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Dict, Optional
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI
+
+load_dotenv()
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 40.0   # ⭐ prevents hanging
+
+# httpx pools are bound to the loop that opened them, so keep one pool
+# per event loop (API loop + the orchestrator's background loop).
+_http_clients: Dict[asyncio.AbstractEventLoop, httpx.AsyncClient] = {}
+
+# key fingerprint -> key; only the fingerprint ever reaches the cache key
+_api_keys: Dict[str, str] = {}
+
+
+# --------------------------------------------------
+# SHARED CLIENTS (one per config, per loop)
+# --------------------------------------------------
+
+def get_openai_client(
+    api_key: Optional[str] = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    base_url: Optional[str] = None
+) -> AsyncOpenAI:
+    """
+    AsyncOpenAI client for the given config on the current event loop.
+    Every config shares the loop's keep-alive connection pool.
+    """
+    api_key = api_key or os.getenv("OPENAI_API_KEY")
+
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY not set")
+
+    key_hash = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+    _api_keys[key_hash] = api_key
+
+    return _build_client(
+        key_hash,
+        timeout,
+        base_url,
+        asyncio.get_running_loop()
+    )
+
+
+@lru_cache(maxsize=8)
+def _build_client(
+    key_hash: str,
+    timeout_s: float,
+    base_url: Optional[str],
+    loop: asyncio.AbstractEventLoop
+) -> AsyncOpenAI:
+
+    return AsyncOpenAI(
+        api_key=_api_keys[key_hash],
+        base_url=base_url,
+        timeout=timeout_s,
+        http_client=_shared_http_client(loop)
+    )
+
+
+def _shared_http_client(loop: asyncio.AbstractEventLoop) -> httpx.AsyncClient:
+
+    if loop not in _http_clients:
+        _http_clients[loop] = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(
+                max_keepalive_connections=32,
+                max_connections=64
+            ),
+            timeout=httpx.Timeout(DEFAULT_TIMEOUT, connect=10.0)
+        )
+
+    return _http_clients[loop]
+
+
+async def close_openai_client() -> None:
+    """
+    Close the pool owned by the current event loop.
+    """
+    http_client = _http_clients.pop(asyncio.get_running_loop(), None)
+
+    # clients wrapping the closed pool must not be handed out again
+    _build_client.cache_clear()
+
+    if http_client is not None:
+        await http_client.aclose()
+        logger.info("OpenAI HTTP pool closed")
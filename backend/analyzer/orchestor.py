@@ -1,10 +1,16 @@
+import os
+import sys
 import logging
 import asyncio
-from typing import Dict, Any, Optional, List
+import threading
+from itertools import chain
+from typing import Dict, Any, Iterable, Iterator, Optional, List
+
+from bs4 import BeautifulSoup
 
 from backend.analyzer.entity_merger import merge_entities
 from backend.models.entity import NormalizedEntity
-from backend.utils.html import make_soup
+from backend.utils.html import make_soup, validate_html
 from backend.extractors.jsonld_extractor import JSONLDExtractor
 from backend.extractors.microdata_extractor import MicrodataExtractor
 from backend.extractors.rdfa_extractor import RDFaExtractor
@@ -12,7 +18,8 @@ from backend.signals.seo_metrics import SEOMetricsAnalyzer
 from backend.analyzer.organization import resolve_organization
 from backend.analyzer.suggestion_engine import SuggestionEngine
 from backend.analyzer.type_resolver import resolve_types
-from backend.analyzer.confidence import enrich_confidence
+from backend.analyzer.confidence import enrich_confidence_batch
+from backend.analyzer.openai_client import close_openai_client
 from backend.analyzer.llm_recommender import (
     infer_page_intent,
     merge_llm_suggestions
@@ -35,57 +42,115 @@ SEO_ANALYZER = SEOMetricsAnalyzer()
 # SAFE ASYNC RUNNER
 # --------------------------------------------------
 
+LLM_TIMEOUT = 60
+
+_LOOP: Optional[asyncio.AbstractEventLoop] = None
+_LOOP_PID: Optional[int] = None
+_LOOP_LOCK = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    """
+    One long-lived event loop per process, running in a daemon thread,
+    so async clients (and their connection pools) survive across calls.
+    """
+    global _LOOP, _LOOP_PID
+
+    with _LOOP_LOCK:
+
+        # forked workers inherit the object but not the thread
+        if _LOOP is None or _LOOP_PID != os.getpid():
+            _LOOP = asyncio.new_event_loop()
+            _LOOP_PID = os.getpid()
+
+            threading.Thread(
+                target=_LOOP.run_forever,
+                name="orchestrator-loop",
+                daemon=True
+            ).start()
+
+    return _LOOP
+
+
 def run_async_safely(coro):
 
+    future = asyncio.run_coroutine_threadsafe(coro, _get_background_loop())
+
     try:
-        loop = asyncio.get_running_loop()
-        future = asyncio.run_coroutine_threadsafe(coro, loop)
-        return future.result()
+        return future.result(timeout=LLM_TIMEOUT)
+    except TimeoutError:
+        future.cancel()
+        raise
 
-    except RuntimeError:
-        loop = asyncio.new_event_loop()
-        try:
-            return loop.run_until_complete(coro)
-        finally:
-            loop.close()
+
+async def shutdown_background_loop():
+    """
+    Close the background loop's OpenAI pool and stop the loop.
+    """
+    global _LOOP
+
+    if _LOOP is None or _LOOP_PID != os.getpid():
+        return
+
+    future = asyncio.run_coroutine_threadsafe(close_openai_client(), _LOOP)
+    await asyncio.wrap_future(future)
+
+    _LOOP.call_soon_threadsafe(_LOOP.stop)
+    _LOOP = None
 
 
 # --------------------------------------------------
 # NORMALIZATION
 # --------------------------------------------------
 
-def _normalize_entities(
+def _iter_normalize_entities(
     entities: List[Dict[str, Any]],
     source: str,
     base_confidence: float
-) -> List[NormalizedEntity]:
-
-    normalized: List[NormalizedEntity] = []
+) -> Iterator[NormalizedEntity]:
 
     for e in entities or []:  # ✅ Never iterate None
         try:
-            normalized.append(
-                NormalizedEntity(
-                    type=str(e.get("@type", "Thing")),
-                    properties=e.get("properties") or e,
-                    source=source,
-                    confidence=base_confidence,
-                    raw=e
-                )
+            yield NormalizedEntity(
+                # interned: matches the loader's names by identity
+                type=sys.intern(str(e.get("@type", "Thing"))),
+                properties=e.get("properties") or e,
+                source=source,
+                confidence=base_confidence,
+                raw=e
             )
         except Exception:
             logger.exception("Failed to normalize entity")
 
-    return normalized
+
+def _iter_resolve_types(
+    entities: Iterable[NormalizedEntity]
+) -> Iterator[NormalizedEntity]:
+
+    for entity in entities:
+        try:
+            entity.resolved_types = resolve_types(entity.type) or frozenset()
+        except Exception:
+            logger.exception("Type resolver failed")
+            entity.resolved_types = frozenset()
+
+        yield entity
 
 
 # --------------------------------------------------
 # ORCHESTRATOR
 # --------------------------------------------------
 
-def analyze_html(html: str, url: Optional[str] = None) -> Dict[str, Any]:
+def analyze_html(
+    html: str,
+    url: Optional[str] = None,
+    soup: Optional[BeautifulSoup] = None,
+    json_ld_blocks: Optional[List[Any]] = None
+) -> Dict[str, Any]:
     """
     Resilient production pipeline.
+    Pass `soup` / `json_ld_blocks` when the caller (fetcher) already
+    parsed them to skip a second parse.
     """
 
     try:
@@ -95,14 +160,21 @@ def analyze_html(html: str, url: Optional[str] = None) -> Dict[str, Any]:
         else:
             logger.info(f"HTML length: {len(html)}")
 
-        soup = make_soup(html)
+        if soup is None:
+            soup = make_soup(html)
+        else:
+            validate_html(html)
 
         # --------------------------------------------------
         # EXTRACTION (ISOLATED)
+        # Sequential on purpose: bs4 tree traversal is pure Python and
+        # holds the GIL, so a thread pool gives no wall-clock gain here.
         # --------------------------------------------------
 
         try:
-            jsonld_entities = JSONLDExtractor.extract_json_ld(soup) or []
+            jsonld_entities = JSONLDExtractor.extract_json_ld(
+                soup, json_ld_blocks
+            ) or []
         except Exception:
             logger.exception("JSON-LD extractor failed")
             jsonld_entities = []
@@ -129,29 +201,26 @@ def analyze_html(html: str, url: Optional[str] = None) -> Dict[str, Any]:
         # NORMALIZATION
         # --------------------------------------------------
 
-        entities: List[NormalizedEntity] = []
-
-        entities += _normalize_entities(jsonld_entities, "jsonld", 0.9)
-        entities += _normalize_entities(microdata_entities, "microdata", 0.7)
-        entities += _normalize_entities(rdfa_entities, "rdfa", 0.6)
+        normalized = chain(
+            _iter_normalize_entities(jsonld_entities, "jsonld", 0.9),
+            _iter_normalize_entities(microdata_entities, "microdata", 0.7),
+            _iter_normalize_entities(rdfa_entities, "rdfa", 0.6)
+        )
 
         # --------------------------------------------------
-        # TYPE RESOLUTION
+        # TYPE RESOLUTION (lazy, consumed by merge)
         # --------------------------------------------------
 
-        for entity in entities:
-            try:
-                entity.resolved_types = resolve_types(entity.type) or []
-            except Exception:
-                logger.exception("Type resolver failed")
-                entity.resolved_types = []
+        resolved = _iter_resolve_types(normalized)
 
         # --------------------------------------------------
         # MERGE
         # --------------------------------------------------
 
+        entities: List[NormalizedEntity]
+
         try:
-            entities = merge_entities(entities) or []
+            entities = merge_entities(resolved) or []
         except Exception:
             logger.exception("Entity merge failed")
             entities = []
@@ -160,11 +229,10 @@ def analyze_html(html: str, url: Optional[str] = None) -> Dict[str, Any]:
         # CONFIDENCE
         # --------------------------------------------------
 
-        for entity in entities:
-            try:
-                enrich_confidence(entity)
-            except Exception:
-                logger.exception("Confidence enrichment failed")
+        try:
+            enrich_confidence_batch(entities)
+        except Exception:
+            logger.exception("Confidence enrichment failed")
 
         logger.info(f"✅ Final merged entities: {len(entities)}")
 
@@ -186,7 +254,7 @@ def analyze_html(html: str, url: Optional[str] = None) -> Dict[str, Any]:
         # --------------------------------------------------
 
         try:
-            signals = SEO_ANALYZER.analyze(html, soup) or {}
+            signals = SEO_ANALYZER.analyze(html) or {}
         except Exception:
             logger.exception("SEO analyzer failed")
             signals = {}
@@ -208,26 +276,32 @@ def analyze_html(html: str, url: Optional[str] = None) -> Dict[str, Any]:
         # ENTITY SUMMARY
         # --------------------------------------------------
 
-        entity_summary: Dict[str, Dict[str, Any]] = {}
+        grouped: Dict[str, List[tuple]] = {}
 
         for e in entities:
-            primary_type = e.type or "Thing"
-
-            entity_summary.setdefault(
-                primary_type,
-                {
-                    "count": 0,
-                    "items": []
-                }
-            )
-
-            entity_summary[primary_type]["count"] += 1
-            entity_summary[primary_type]["items"].append({
-                "@type": e.type,
-                "properties": e.properties,
-                "source": e.source,
-                "confidence": e.confidence
-            })
+            e_type = e.type
+            items = grouped.get(e_type or "Thing")
+
+            if items is None:
+                items = grouped[e_type or "Thing"] = []
+
+            items.append((e_type, e.properties, e.source, e.confidence))
+
+        entity_summary: Dict[str, Dict[str, Any]] = {
+            primary_type: {
+                "count": len(items),
+                "items": [
+                    {
+                        "@type": t,
+                        "properties": props,
+                        "source": source,
+                        "confidence": confidence
+                    }
+                    for t, props, source, confidence in items
+                ]
+            }
+            for primary_type, items in grouped.items()
+        }
 
         entity_summary = entity_summary or {}
 
@@ -1,6 +1,11 @@
+import os
 import json
+import sys
+import pickle
+import logging
+from itertools import chain
 from pathlib import Path
-from typing import Dict, Set, Optional
+from typing import Dict, FrozenSet, Set, Optional, Tuple
 
 # --------------------------------------------------
 # File path
@@ -8,11 +13,25 @@ from typing import Dict, Set, Optional
 
 SCHEMA_FILE = Path(__file__).resolve().parent.parent / "data" / "schemaorg.jsonld"
 
+# Prebuilt graph + closures; rebuilt whenever the JSON-LD is newer
+CACHE_FILE = SCHEMA_FILE.with_suffix(".graph.pkl")
+
+# Bump when the cached state layout changes
+CACHE_VERSION = 2
+
+logger = logging.getLogger(__name__)
+
 # --------------------------------------------------
 # Internal cache (singleton)
 # --------------------------------------------------
 
 _SCHEMA_GRAPH: Optional[Dict[str, Set[str]]] = None
+_ALL_TYPES: Optional[FrozenSet[str]] = None
+_ANCESTORS: Optional[Dict[str, FrozenSet[str]]] = None
+_DESCENDANTS: Optional[Dict[str, FrozenSet[str]]] = None
+_CLOSURES: Optional[Dict[str, FrozenSet[str]]] = None
+
+_EMPTY: FrozenSet[str] = frozenset()
 
 
 # --------------------------------------------------
@@ -26,13 +45,136 @@ def load_schemaorg_ontology() -> Dict[str, Set[str]]:
     Returns:
         Dict[parent_type, Set[child_types]]
     """
-    global _SCHEMA_GRAPH
+    _ensure_loaded()
+    assert _SCHEMA_GRAPH is not None
+    return _SCHEMA_GRAPH
+
+
+def get_all_schema_types() -> FrozenSet[str]:
+    """
+    Flattened set of every known schema.org type (parents + children).
+    Computed once per process.
+    """
+    _ensure_loaded()
+    assert _ALL_TYPES is not None
+    return _ALL_TYPES
+
 
-    if _SCHEMA_GRAPH is None:
+def get_ancestors(cls: str) -> FrozenSet[str]:
+    """
+    All transitive superclasses of `cls` (excluding itself).
+    """
+    _ensure_loaded()
+    assert _ANCESTORS is not None
+    return _ANCESTORS.get(cls, _EMPTY)
+
+
+def get_type_closure(cls: str) -> FrozenSet[str]:
+    """
+    `cls` plus all its transitive superclasses (single dict lookup).
+    Unknown types resolve to themselves.
+    """
+    _ensure_loaded()
+    assert _CLOSURES is not None
+    closure = _CLOSURES.get(cls)
+    return closure if closure is not None else frozenset((cls,))
+
+
+def get_descendants(cls: str) -> FrozenSet[str]:
+    """
+    All transitive subclasses of `cls` (excluding itself).
+    """
+    _ensure_loaded()
+    assert _DESCENDANTS is not None
+    return _DESCENDANTS.get(cls, _EMPTY)
+
+
+def _ensure_loaded() -> None:
+    global _SCHEMA_GRAPH, _ALL_TYPES, _ANCESTORS, _DESCENDANTS, _CLOSURES
+
+    if _SCHEMA_GRAPH is not None:
+        return
+
+    state = _read_cache()
+
+    if state is None:
         print("✅ Loading schema.org ontology (once per process)")
-        _SCHEMA_GRAPH = _build_schema_graph()
+        state = _build_state()
+        _write_cache(state)
+
+    state = _intern_state(state)
+
+    _ALL_TYPES = state["all_types"]
+    _ANCESTORS = state["ancestors"]
+    _DESCENDANTS = state["descendants"]
+    _CLOSURES = state["closures"]
+    _SCHEMA_GRAPH = state["children"]
 
-    return _SCHEMA_GRAPH
+
+def _intern_state(state: Dict) -> Dict:
+    """
+    Re-key everything on interned type names (pickle / json never intern),
+    so membership checks against extracted types hit on identity.
+    """
+    names: Dict[str, str] = {}
+
+    def i(name: str) -> str:
+        interned = names.get(name)
+        if interned is None:
+            interned = names[name] = sys.intern(name)
+        return interned
+
+    def closure_map(m: Dict[str, FrozenSet[str]]) -> Dict[str, FrozenSet[str]]:
+        return {i(k): frozenset(map(i, v)) for k, v in m.items()}
+
+    return {
+        **state,
+        "children": {i(k): set(map(i, v)) for k, v in state["children"].items()},
+        "ancestors": closure_map(state["ancestors"]),
+        "descendants": closure_map(state["descendants"]),
+        "closures": closure_map(state["closures"]),
+        "all_types": frozenset(map(i, state["all_types"])),
+    }
+
+
+# --------------------------------------------------
+# Disk cache
+# --------------------------------------------------
+
+def _read_cache() -> Optional[Dict]:
+    try:
+        if CACHE_FILE.stat().st_mtime < SCHEMA_FILE.stat().st_mtime:
+            return None
+
+        with open(CACHE_FILE, "rb") as f:
+            state = pickle.load(f)
+
+        if state.get("version") != CACHE_VERSION:
+            return None
+
+        return state
+
+    except FileNotFoundError:
+        return None
+
+    except Exception as e:
+        logger.warning(f"Ignoring unreadable ontology cache: {e}")
+        return None
+
+
+def _write_cache(state: Dict) -> None:
+    tmp = CACHE_FILE.with_name(f"{CACHE_FILE.name}.{os.getpid()}.tmp")
+
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump(state, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        # atomic: concurrent workers never see a partial file
+        os.replace(tmp, CACHE_FILE)
+
+    except OSError as e:
+        logger.warning(f"Could not write ontology cache: {e}")
+        tmp.unlink(missing_ok=True)
 
 
 # --------------------------------------------------
@@ -69,6 +211,84 @@ def _build_schema_graph() -> Dict[str, Set[str]]:
     return graph
 
 
+def _build_state() -> Dict:
+    graph = _build_schema_graph()
+    ancestors, descendants = _build_closures(graph)
+
+    return {
+        "version": CACHE_VERSION,
+        "children": graph,
+        "ancestors": ancestors,
+        "descendants": descendants,
+        "closures": {
+            cls: anc | {cls} for cls, anc in ancestors.items()
+        },
+        "all_types": frozenset(
+            chain(graph.keys(), chain.from_iterable(graph.values()))
+        ),
+    }
+
+
+def _build_closures(
+    graph: Dict[str, Set[str]]
+) -> Tuple[Dict[str, FrozenSet[str]], Dict[str, FrozenSet[str]]]:
+    """
+    Transitive closure of the class hierarchy: (ancestors, descendants).
+    ancestors(t) = U parents(t) + ancestors(parent), memoized, so every
+    class is expanded once; descendants are the inverse of that map.
+    """
+    parents: Dict[str, Set[str]] = {}
+
+    for parent, children in graph.items():
+        for child in children:
+            parents.setdefault(child, set()).add(parent)
+
+    all_types = set(graph) | set(parents)
+
+    ancestors: Dict[str, FrozenSet[str]] = {}
+    for cls in all_types:
+        _ancestors_of(cls, parents, ancestors)
+
+    below: Dict[str, Set[str]] = {cls: set() for cls in all_types}
+    for cls, anc in ancestors.items():
+        for parent in anc:
+            below[parent].add(cls)
+
+    descendants = {cls: frozenset(sub) for cls, sub in below.items()}
+
+    return ancestors, descendants
+
+
+def _ancestors_of(
+    cls: str,
+    parents: Dict[str, Set[str]],
+    memo: Dict[str, FrozenSet[str]],
+    path: Optional[Set[str]] = None
+) -> FrozenSet[str]:
+    """
+    Memoized recursion (hierarchy depth is ~10). `path` cuts cycles,
+    which schema.org never has but a bad data file could.
+    """
+    if cls in memo:
+        return memo[cls]
+
+    path = path if path is not None else set()
+    path.add(cls)
+
+    acc: Set[str] = set()
+    for parent in parents.get(cls, ()):
+        if parent in path:
+            continue
+        acc.add(parent)
+        acc |= _ancestors_of(parent, parents, memo, path)
+
+    path.discard(cls)
+    acc.discard(cls)
+
+    memo[cls] = frozenset(acc)
+    return memo[cls]
+
+
 # --------------------------------------------------
 # Helpers
 # --------------------------------------------------
@@ -1,14 +1,86 @@
+import sys
 import yaml
-from typing import Dict, Any, Set, List
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Any, Set, List, FrozenSet, Optional, Tuple
 from pathlib import Path
-from backend.analyzer.type_resolver import is_subclass
+from backend.analyzer.type_resolver import resolve_types
+
+# libyaml-backed loader when available (much faster than pure Python)
+_YAML_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+SIGNAL_PREFIX = "signal."
+
+
+@dataclass(frozen=True, slots=True)
+class CompiledRule:
+    """
+    YAML rule with its `when` block pre-parsed:
+    signal paths are split once, not on every request.
+    """
+    schema: str
+    confidence: str
+    category: str
+    reason: str
+    missing_schema: Optional[str]
+    signal_checks: Tuple[Tuple[Tuple[str, ...], Any], ...]
+
+
+def _compile_rule(rule: Dict[str, Any]) -> Optional[CompiledRule]:
+    """
+    None for rules that can never match (no target / unknown condition).
+    """
+    schema = rule.get("suggest")
+    if not schema:
+        return None
+
+    missing_schema = None
+    signal_checks = []
+
+    for key, expected in (rule.get("when") or {}).items():
+
+        if key == "missing_schema":
+            missing_schema = (
+                sys.intern(expected) if isinstance(expected, str) else expected
+            )
+            continue
+
+        if key.startswith(SIGNAL_PREFIX):
+            path = tuple(key[len(SIGNAL_PREFIX):].split("."))
+            signal_checks.append((path, expected))
+            continue
+
+        return None
+
+    return CompiledRule(
+        schema=sys.intern(str(schema)),
+        confidence=rule.get("confidence", "medium"),
+        category=rule.get("category", "General"),
+        reason=rule.get("reason", ""),
+        missing_schema=missing_schema,
+        signal_checks=tuple(signal_checks)
+    )
+
+
+@lru_cache(maxsize=16)
+def _load_rules(path: str, mtime: float) -> Tuple[CompiledRule, ...]:
+    """
+    Parsed + compiled rules cached per (path, mtime) — edits still reload in dev.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        raw = yaml.load(f, Loader=_YAML_LOADER) or []
+
+    compiled = (_compile_rule(rule) for rule in raw)
+    return tuple(rule for rule in compiled if rule is not None)
 
 
 # ==================================================
 # Schema Satisfaction Rules (Semantic Completeness)
 # ==================================================
 
-SCHEMA_SATISFACTION_RULES = {
+SCHEMA_SATISFACTION_RULES: Dict[str, Dict[str, List[Set[str]]]] = {
 
     # ---------------- FAQ ----------------
     "FAQPage": {
@@ -132,6 +204,13 @@ SCHEMA_SATISFACTION_RULES = {
     }
 }
 
+# target -> required type sets, frozen once at import; satisfaction is
+# then a subset test against the page's ancestor-expanded types
+_SAT_INDEX: Dict[str, List[FrozenSet[str]]] = {
+    target: [frozenset(required) for required in rule.get("any_of", [])]
+    for target, rule in SCHEMA_SATISFACTION_RULES.items()
+}
+
 
 class SuggestionEngine:
     """
@@ -143,7 +222,7 @@ class SuggestionEngine:
     # Ontology-based related schema expansion
     # --------------------------------------------------
 
-    RELATED_SCHEMAS = {
+    RELATED_SCHEMAS: Dict[str, Set[str]] = {
 
         # -------- Content --------
         "Article": {"Author", "Publisher"},
@@ -175,11 +254,10 @@ class SuggestionEngine:
     # Init
     # --------------------------------------------------
 
-    def __init__(self, rules_path: str):
-        rules_file = Path(rules_path)
+    def __init__(self, rules_path: str) -> None:
+        rules_file = Path(rules_path).resolve()
 
-        with open(rules_file, "r", encoding="utf-8") as f:
-            self.rules = yaml.safe_load(f) or []
+        self.rules = _load_rules(str(rules_file), rules_file.stat().st_mtime)
 
     # --------------------------------------------------
     # Public API
@@ -196,28 +274,32 @@ class SuggestionEngine:
             t for e in entities for t in e.resolved_types
         }
 
+        # Every type present on page + all its ancestors:
+        # "X is covered" becomes a single membership check
+        present_ancestors: Set[str] = set().union(
+            *(resolve_types(t) for t in present_types)
+        )
+
         suggestions: List[Dict[str, Any]] = []
         suggested_schemas: Set[str] = set()
 
         # ---------------- Layer 1: Rule-based ----------------
         for rule in self.rules:
-            if not self._rule_matches(rule, present_types, signals):
+            if not self._rule_matches(rule, present_ancestors, signals):
                 continue
 
-            schema = rule["suggest"]
+            schema = rule.schema
 
             # Skip if already present (ontology-aware)
-            if any(is_subclass(t, schema) for t in present_types):
+            if schema in present_ancestors:
                 continue
 
             # Skip if semantically satisfied
-            if self._is_schema_satisfied(schema, present_types):
+            if self._is_schema_satisfied(schema, present_ancestors):
                 continue
 
             # Domain guard: Review must have Product
-            if schema == "Review" and not any(
-                is_subclass(t, "Product") for t in present_types
-            ):
+            if schema == "Review" and "Product" not in present_ancestors:
                 continue
 
             if schema in suggested_schemas:
@@ -225,9 +307,9 @@ class SuggestionEngine:
 
             suggestions.append({
                 "schema": schema,
-                "confidence": rule.get("confidence", "medium"),
-                "category": rule.get("category", "General"),
-                "reason": rule.get("reason", ""),
+                "confidence": rule.confidence,
+                "category": rule.category,
+                "reason": rule.reason,
                 "schema_url": f"https://schema.org/{schema}"
             })
 
@@ -236,7 +318,7 @@ class SuggestionEngine:
         # ---------------- Layer 3: Ontology-based expansion ----------------
         suggestions.extend(
             self._expand_related_schemas(
-                present_types,
+                present_ancestors,
                 suggested_schemas
             )
         )
@@ -249,28 +331,19 @@ class SuggestionEngine:
 
     def _rule_matches(
         self,
-        rule: Dict[str, Any],
-        present_types: Set[str],
+        rule: CompiledRule,
+        present_ancestors: Set[str],
         signals: Dict[str, Any]
     ) -> bool:
 
-        conditions = rule.get("when", {})
-
-        for key, expected in conditions.items():
-
-            if key == "missing_schema":
-                if any(is_subclass(t, expected) for t in present_types):
-                    return False
-                continue
-
-            if key.startswith("signal."):
-                actual = self._get_signal_value(signals, key)
-                if actual != expected:
-                    return False
-                continue
-
+        # cheapest check first: most rules drop out on presence
+        if rule.missing_schema in present_ancestors:
             return False
 
+        for path, expected in rule.signal_checks:
+            if self._get_signal_value(signals, path) != expected:
+                return False
+
         return True
 
     # --------------------------------------------------
@@ -279,38 +352,40 @@ class SuggestionEngine:
 
     def _expand_related_schemas(
         self,
-        present_types: Set[str],
+        present_ancestors: Set[str],
         suggested_schemas: Set[str]
     ) -> List[Dict[str, Any]]:
 
         expanded: List[Dict[str, Any]] = []
 
-        for present in present_types:
-            for parent, related_set in self.RELATED_SCHEMAS.items():
+        if _RELATED_PARENTS.isdisjoint(present_ancestors):
+            return expanded
 
-                if not is_subclass(present, parent):
-                    continue
+        for parent, related_set in _RELATED_ITEMS:
 
-                for related in related_set:
+            if parent not in present_ancestors:
+                continue
 
-                    if any(is_subclass(t, related) for t in present_types):
-                        continue
+            for related in related_set:
 
-                    if self._is_schema_satisfied(related, present_types):
-                        continue
+                if related in present_ancestors:
+                    continue
+
+                if self._is_schema_satisfied(related, present_ancestors):
+                    continue
 
-                    if related in suggested_schemas:
-                        continue
+                if related in suggested_schemas:
+                    continue
 
-                    expanded.append({
-                        "schema": related,
-                        "confidence": "low",
-                        "category": "Related",
-                        "reason": f"Commonly used with {parent}",
-                        "schema_url": f"https://schema.org/{related}"
-                    })
+                expanded.append({
+                    "schema": related,
+                    "confidence": "low",
+                    "category": "Related",
+                    "reason": f"Commonly used with {parent}",
+                    "schema_url": f"https://schema.org/{related}"
+                })
 
-                    suggested_schemas.add(related)
+                suggested_schemas.add(related)
 
         return expanded
 
@@ -321,33 +396,22 @@ class SuggestionEngine:
     def _is_schema_satisfied(
         self,
         target_schema: str,
-        present_types: Set[str]
+        present_ancestors: Set[str]
     ) -> bool:
 
-        rule = SCHEMA_SATISFACTION_RULES.get(target_schema)
-        if not rule:
-            return False
-
-        any_of_sets = rule.get("any_of", [])
-
-        for required_set in any_of_sets:
-            if all(
-                any(is_subclass(t, required) for t in present_types)
-                for required in required_set
-            ):
-                return True
-
-        return False
+        return any(
+            required.issubset(present_ancestors)
+            for required in _SAT_INDEX.get(target_schema, ())
+        )
 
     # --------------------------------------------------
     # Helpers
     # --------------------------------------------------
 
-    def _get_signal_value(self, signals: Dict[str, Any], path: str):
-        parts = path.replace("signal.", "").split(".")
-        value = signals
+    def _get_signal_value(self, signals: Dict[str, Any], path: Tuple[str, ...]) -> Any:
+        value: Any = signals
 
-        for part in parts:
+        for part in path:
             if not isinstance(value, dict):
                 return None
             value = value.get(part)
@@ -359,9 +423,21 @@ class SuggestionEngine:
         suggestions: List[Dict[str, Any]]
     ) -> Dict[str, List[Dict[str, Any]]]:
 
-        grouped: Dict[str, List[Dict[str, Any]]] = {}
+        grouped: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
 
         for s in suggestions:
-            grouped.setdefault(s["category"], []).append(s)
+            grouped[s["category"]].append(s)
+
+        return dict(grouped)
+
 
-        return grouped
+# Frozen once at import (module level, not class body, so the module
+# stays mypyc-compilable). present_ancestors already holds every ancestor
+# of every present type, so keying on the parent itself is the inverted
+# (descendant -> related) index without enumerating descendants.
+# Sorted for stable output order.
+_RELATED_PARENTS: FrozenSet[str] = frozenset(SuggestionEngine.RELATED_SCHEMAS)
+_RELATED_ITEMS: Tuple[Tuple[str, Tuple[str, ...]], ...] = tuple(
+    (parent, tuple(sorted(related)))
+    for parent, related in SuggestionEngine.RELATED_SCHEMAS.items()
+)
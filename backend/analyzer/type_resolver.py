@@ -1,10 +1,16 @@
-from backend.analyzer.schemaorg_loader import load_schemaorg_ontology
+from functools import lru_cache
+from backend.analyzer.schemaorg_loader import get_ancestors, get_type_closure
 
-def resolve_types(schema_type: str) -> set[str]:
-    SCHEMA_GRAPH = load_schemaorg_ontology()
-    resolved = {schema_type}
-    resolved |= SCHEMA_GRAPH.get(schema_type, set())
-    return resolved
+# Ontology is loaded once per process (schemaorg_loader singleton) with the
+# subClassOf closure materialized and all names interned, so both lookups
+# are O(1) dict hits; the caches only skip the Python call overhead on
+# hot paths.
 
+@lru_cache(maxsize=4096)
+def resolve_types(schema_type: str) -> frozenset[str]:
+    return get_type_closure(schema_type)
+
+# called per (present type x rule) pair from SuggestionEngine
+@lru_cache(maxsize=16384)
 def is_subclass(schema_type: str, parent: str) -> bool:
-    return parent in resolve_types(schema_type)
+    return parent == schema_type or parent in get_ancestors(schema_type)
@@ -1,7 +1,13 @@
 from fastapi import APIRouter, HTTPException
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
+from bs4 import BeautifulSoup
 from fastapi.concurrency import run_in_threadpool
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
+import logging
 import asyncio
+import os
 
 from backend.analyzer.orchestor import analyze_html
 from backend.services.fetcher import extract_page
@@ -11,6 +17,70 @@ router = APIRouter()
 MAX_URLS = 5
 MAX_HTMLS = 5
 
+# analyze_html is CPU-bound (parse + ontology expansion): run it in worker
+# processes so batched requests don't contend for the GIL.
+# ANALYZE_WORKERS=0 keeps it on the threadpool.
+ANALYZE_WORKERS = int(os.getenv("ANALYZE_WORKERS", os.cpu_count() or 1))
+
+_cpu_pool: Optional[ProcessPoolExecutor] = None
+
+
+# --------------------------------------------------
+# CPU POOL
+# --------------------------------------------------
+
+def _init_worker():
+    logging.basicConfig(level=logging.INFO)
+
+
+def _get_cpu_pool() -> ProcessPoolExecutor:
+    global _cpu_pool
+
+    if _cpu_pool is None:
+        # spawn: never fork a process that already runs loop / pool threads
+        _cpu_pool = ProcessPoolExecutor(
+            max_workers=ANALYZE_WORKERS,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker
+        )
+
+    return _cpu_pool
+
+
+def shutdown_cpu_pool() -> None:
+    global _cpu_pool
+
+    if _cpu_pool is not None:
+        _cpu_pool.shutdown(wait=False, cancel_futures=True)
+        _cpu_pool = None
+
+
+async def run_analysis(
+    html: str,
+    url: Optional[str] = None,
+    json_ld_blocks: Optional[List[Any]] = None,
+    soup: Optional[BeautifulSoup] = None
+) -> Dict[str, Any]:
+
+    if ANALYZE_WORKERS <= 0:
+        # same process: reuse the fetcher's tree instead of parsing again
+        return await run_in_threadpool(
+            analyze_html, html, url, soup, json_ld_blocks
+        )
+
+    # the soup stays behind: re-parsing in the worker is cheaper than
+    # pickling a bs4 tree across the process boundary
+    loop = asyncio.get_running_loop()
+
+    try:
+        return await loop.run_in_executor(
+            _get_cpu_pool(), analyze_html, html, url, None, json_ld_blocks
+        )
+    except BrokenProcessPool:
+        # a worker died (OOM / crash): start a fresh pool next time
+        shutdown_cpu_pool()
+        raise
+
 
 # --------------------------------------------------
 # URL PROCESSOR (PARALLEL SAFE)
@@ -19,13 +89,17 @@ MAX_HTMLS = 5
 async def process_url(url: str):
 
     try:
-        page = await extract_page(url)
+        # worker processes parse the html themselves: only digest (and
+        # keep the soup) when analysis runs in this process
+        in_process = ANALYZE_WORKERS <= 0
+        page = await extract_page(url, keep_soup=in_process, digest=in_process)
         html = page["html"]
 
-        result = await run_in_threadpool(
-            analyze_html,
+        result = await run_analysis(
             html,
-            url
+            url,
+            page.get("metadata", {}).get("json_ld"),
+            page.get("soup")
         )
 
         result["fetch_mode"] = page.get("fetch_mode")
@@ -43,11 +117,7 @@ async def process_url(url: str):
 async def process_html(i: int, html: str):
 
     try:
-        result = await run_in_threadpool(
-            analyze_html,
-            html,
-            None
-        )
+        result = await run_analysis(html)
 
         return f"html_{i}", result
 
@@ -1,6 +1,14 @@
 from fastapi import APIRouter, HTTPException
 from typing import Dict, Any
-from backend.analyzer.llm_schema_generator import generate_schema_ai
+from backend.analyzer.llm_schema_generator import (
+    generate_schema_ai,
+    generate_schemas_ai
+)
+from backend.analyzer.llm_batch import (
+    BATCH_MODE_ENABLED,
+    get_schema_batch,
+    submit_schema_batch
+)
 
 router = APIRouter()
 
@@ -28,3 +36,81 @@ async def generate_schema(payload: Dict[str, Any]):
 
     except Exception as e:
         raise HTTPException(500, str(e))
+
+
+@router.post("/generate-schema/batch")
+async def generate_schema_batch(payload: Dict[str, Any]):
+    """
+    Several schemas for one page in a single request; the page context
+    (entities / signals / url) is sent once. Results keep input order.
+    """
+
+    schemas = payload.get("schemas")
+
+    if not schemas or not isinstance(schemas, list):
+        raise HTTPException(400, "Schemas required")
+
+    try:
+        results = await generate_schemas_ai(
+            schemas,
+            payload.get("entities"),
+            payload.get("signals"),
+            payload.get("url")
+        )
+
+    except Exception as e:
+        raise HTTPException(500, str(e))
+
+    return {
+        "results": [
+            {"error": "Schema generation failed", "schema_requested": name}
+            if isinstance(result, BaseException) else result
+            for name, result in zip(schemas, results)
+        ]
+    }
+
+
+# --------------------------------------------------
+# OpenAI Batch API jobs (LLM_BATCH_MODE, bulk / offline runs)
+# --------------------------------------------------
+
+@router.post("/generate-schema/jobs")
+async def submit_schema_job(payload: Dict[str, Any]):
+    """
+    Queue schemas on the Batch API and return the batch id at once;
+    poll GET /generate-schema/jobs/{batch_id} for the results.
+    """
+
+    if not BATCH_MODE_ENABLED:
+        raise HTTPException(404, "Batch mode disabled")
+
+    schemas = payload.get("schemas")
+
+    if not schemas or not isinstance(schemas, list):
+        raise HTTPException(400, "Schemas required")
+
+    try:
+        batch_id = await submit_schema_batch(
+            schemas,
+            payload.get("entities"),
+            payload.get("signals"),
+            payload.get("url")
+        )
+
+    except Exception as e:
+        raise HTTPException(500, str(e))
+
+    return {"batch_id": batch_id, "status": "submitted"}
+
+
+@router.get("/generate-schema/jobs/{batch_id}")
+async def schema_job_status(batch_id: str):
+
+    if not BATCH_MODE_ENABLED:
+        raise HTTPException(404, "Batch mode disabled")
+
+    try:
+        return await get_schema_batch(batch_id)
+
+    except Exception as e:
+        raise HTTPException(500, str(e))
@@ -1,85 +1,170 @@
 import json
+import orjson
 import logging
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional
 from bs4 import BeautifulSoup
 
 logger = logging.getLogger(__name__)
 
 
+def is_ld_json(script_type: Optional[str]) -> bool:
+    return bool(script_type) and "ld+json" in script_type.lower()
+
+
 class JSONLDExtractor:
     """
     JSON-LD extractor with nested entity detection.
     """
 
     @staticmethod
-    def extract_json_ld(soup: BeautifulSoup) -> List[Dict[str, Any]]:
+    def extract_json_ld(
+        soup: BeautifulSoup,
+        blocks: Optional[List[Any]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        `blocks`: output of parse_blocks() when the caller already has it.
+        """
         results: List[Dict[str, Any]] = []
 
-        scripts = soup.find_all("script", type="application/ld+json")
+        if blocks is None:
+            blocks = JSONLDExtractor.parse_blocks(soup)
+
+        for data in blocks:
+            try:
+                items = data if isinstance(data, list) else [data]
+
+                for block in items:
+                    JSONLDExtractor._extract_entities(block, results)
+
+            except Exception as e:
+                logger.debug(f"JSON-LD extraction error ignored: {e}")
+
+        return results
+
+    @staticmethod
+    def parse_blocks(soup: BeautifulSoup) -> List[Any]:
+        """
+        Parsed body of every ld+json script, in document order.
+        Also feeds fetcher.extract_metadata, so each block is parsed once.
+        """
+        blocks: List[Any] = []
 
-        for script in scripts:
+        for script in soup.find_all("script", type=is_ld_json):
             if not script.string:
                 continue
 
             try:
-                data = json.loads(script.string.strip())
-                blocks = data if isinstance(data, list) else [data]
-
-                for block in blocks:
-                    JSONLDExtractor._extract_entities_recursive(block, results)
-
+                blocks.append(JSONLDExtractor.loads(script.string))
             except Exception as e:
                 logger.debug(f"JSON-LD parse error ignored: {e}")
 
-        return results
+        return blocks
+
+    @staticmethod
+    def loads(text: str) -> Any:
+        """
+        orjson first (C parser, tolerates surrounding whitespace);
+        stdlib only for the NaN / Infinity literals orjson rejects.
+        """
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            return json.loads(text)
 
     # --------------------------------------------------
-    # Recursive extraction
+    # Extraction (iterative, pre-order)
     # --------------------------------------------------
 
     @staticmethod
-    def _extract_entities_recursive(
+    def _extract_entities(
         obj: Any,
         collected: List[Dict[str, Any]]
     ):
-        if isinstance(obj, dict):
-            if "@type" in obj:
-                cleaned = JSONLDExtractor._remove_imageobjects(obj)
-                if cleaned:
-                    collected.append(cleaned)
+        cleaned = JSONLDExtractor._remove_imageobjects_all(obj)
+
+        stack = [obj]
+
+        while stack:
+            cur = stack.pop()
 
-            for value in obj.values():
-                JSONLDExtractor._extract_entities_recursive(value, collected)
+            if isinstance(cur, dict):
+                if "@type" in cur:
+                    entity = cleaned.get(id(cur))
+                    if entity:
+                        collected.append(entity)
 
-        elif isinstance(obj, list):
-            for item in obj:
-                JSONLDExtractor._extract_entities_recursive(item, collected)
+                children = cur.values()
+
+            elif isinstance(cur, list):
+                children = cur
+
+            else:
+                continue
+
+            # reversed: keep document order when popping
+            stack.extend(
+                c for c in reversed(list(children))
+                if isinstance(c, (dict, list))
+            )
 
     # --------------------------------------------------
     # Cleanup helpers
     # --------------------------------------------------
 
     @staticmethod
-    def _remove_imageobjects(obj):
+    def _remove_imageobjects_all(root: Any) -> Dict[int, Any]:
         """
-        Remove ImageObject nodes recursively.
+        Remove ImageObject nodes (and null values) for every container in
+        one bottom-up pass: id(node) -> cleaned node, None if dropped.
+        Copy-on-write — untouched subtrees are returned as-is, not rebuilt.
         """
-        if isinstance(obj, dict):
-            if obj.get("@type") == "ImageObject":
-                return None
-
-            cleaned = {}
-            for k, v in obj.items():
-                v_clean = JSONLDExtractor._remove_imageobjects(v)
-                if v_clean is not None:
-                    cleaned[k] = v_clean
+        cleaned: Dict[int, Any] = {}
+
+        if not isinstance(root, (dict, list)):
             return cleaned
 
-        if isinstance(obj, list):
-            return [
-                item for item in
-                (JSONLDExtractor._remove_imageobjects(i) for i in obj)
-                if item is not None
-            ]
+        stack = [(root, False)]
+
+        while stack:
+            node, ready = stack.pop()
+
+            if not ready:
+                stack.append((node, True))
+                children = node.values() if isinstance(node, dict) else node
+                stack.extend(
+                    (c, False) for c in children
+                    if isinstance(c, (dict, list))
+                )
+                continue
 
-        return obj
+            if isinstance(node, dict):
+                if node.get("@type") == "ImageObject":
+                    cleaned[id(node)] = None
+                    continue
+
+                out = {}
+                changed = False
+                for k, v in node.items():
+                    v_clean = cleaned.get(id(v), v) if isinstance(v, (dict, list)) else v
+                    if v_clean is not v:
+                        changed = True
+                    if v_clean is None:
+                        changed = True
+                        continue
+                    out[k] = v_clean
+
+                cleaned[id(node)] = out if changed else node
+
+            else:
+                items = [
+                    cleaned.get(id(i), i) if isinstance(i, (dict, list)) else i
+                    for i in node
+                ]
+                kept = [i for i in items if i is not None]
+
+                unchanged = len(kept) == len(node) and all(
+                    a is b for a, b in zip(kept, node)
+                )
+                cleaned[id(node)] = node if unchanged else kept
+
+        return cleaned
@@ -1,6 +1,7 @@
+import sys
 import logging
-from typing import Dict, List, Any
-from bs4 import BeautifulSoup
+from typing import Dict, List, Any, Iterator
+from bs4 import BeautifulSoup, Tag
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +37,10 @@ class MicrodataExtractor:
         if not itemtype:
             return None
 
-        schema_type = itemtype.split("/")[-1]
+        schema_type = sys.intern(itemtype.split("/")[-1])
         properties: Dict[str, Any] = {}
 
-        for prop in node.select("[itemprop]"):
+        for prop in MicrodataExtractor._iter_props(node):
             name = prop.get("itemprop")
             if not name:
                 continue
@@ -61,3 +62,25 @@ class MicrodataExtractor:
                 "properties": properties
             }
         }
+
+    @staticmethod
+    def _iter_props(node) -> Iterator[Tag]:
+        """
+        Own itemprops in document order. Nested itemscopes are yielded
+        (they are properties themselves) but not descended into —
+        their properties belong to the nested item.
+        """
+        stack = [c for c in reversed(node.contents) if isinstance(c, Tag)]
+
+        while stack:
+            child = stack.pop()
+
+            if child.has_attr("itemprop"):
+                yield child
+
+            if child.has_attr("itemscope"):
+                continue
+
+            stack.extend(
+                c for c in reversed(child.contents) if isinstance(c, Tag)
+            )
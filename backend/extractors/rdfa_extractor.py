@@ -1,6 +1,7 @@
+import sys
 import logging
-from typing import Dict, List, Any
-from bs4 import BeautifulSoup
+from typing import Dict, List, Any, Iterator
+from bs4 import BeautifulSoup, Tag
 
 logger = logging.getLogger(__name__)
 
@@ -36,10 +37,10 @@ class RDFaExtractor:
         if not typeof:
             return None
 
-        schema_type = typeof.split(":")[-1]
+        schema_type = sys.intern(typeof.split(":")[-1])
         properties: Dict[str, Any] = {}
 
-        for prop in node.select("[property]"):
+        for prop in RDFaExtractor._iter_props(node):
             name = prop.get("property")
             if not name:
                 continue
@@ -56,3 +57,24 @@ class RDFaExtractor:
                 "properties": properties
             }
         }
+
+    @staticmethod
+    def _iter_props(node) -> Iterator[Tag]:
+        """
+        Own properties in document order, pruned at nested `typeof`
+        nodes (those start a separate entity).
+        """
+        stack = [c for c in reversed(node.contents) if isinstance(c, Tag)]
+
+        while stack:
+            child = stack.pop()
+
+            if child.has_attr("property"):
+                yield child
+
+            if child.has_attr("typeof"):
+                continue
+
+            stack.extend(
+                c for c in reversed(child.contents) if isinstance(c, Tag)
+            )
@@ -9,8 +9,12 @@ if sys.platform.startswith("win"):
         asyncio.WindowsProactorEventLoopPolicy()
     )
 
-from backend.api.analyze import router as analyze_router
+from backend.api.analyze import router as analyze_router, shutdown_cpu_pool
 from backend.api.schema import router as schema_router
+from backend.analyzer.openai_client import close_openai_client
+from backend.analyzer.orchestor import shutdown_background_loop
+from backend.services.fetcher import close_http_client
+from backend.services.browser_pool import close_pool
 
 logging.basicConfig(
     level=logging.INFO,
@@ -81,5 +85,10 @@ def on_startup():
     logger.info("🚀 EntityScope Phase-1 API started")
 
 @app.on_event("shutdown")
-def on_shutdown():
+async def on_shutdown():
     logger.info("🛑 EntityScope API shutting down")
+    await close_openai_client()
+    await shutdown_background_loop()
+    await close_http_client()
+    await close_pool()
+    shutdown_cpu_pool()
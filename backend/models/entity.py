@@ -1,7 +1,7 @@
 from dataclasses import dataclass, field
-from typing import Dict, Any, Set
+from typing import Dict, Any, FrozenSet, Tuple
 
-@dataclass
+@dataclass(slots=True)
 class NormalizedEntity:
     type: str
     properties: Dict[str, Any]
@@ -9,4 +9,16 @@ class NormalizedEntity:
     confidence: float
     raw: Dict[str, Any]
 
-    resolved_types: Set[str] = field(default_factory=set)
+    # type + ancestors; resolved once, never mutated
+    resolved_types: FrozenSet[str] = field(default_factory=frozenset)
+
+    # (type, name, url) casefolded once at construction; used by the merger
+    _identity_key: Tuple[str, str, str] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        props = self.properties
+        self._identity_key = (
+            self.type,
+            str(props.get("name") or "").casefold(),
+            str(props.get("url") or "").casefold()
+        )
@@ -0,0 +1,128 @@
+import os
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+from playwright.async_api import (
+    async_playwright,
+    Browser,
+    Page,
+    Playwright
+)
+
+logger = logging.getLogger(__name__)
+
+BROWSER_ARGS = ["--disable-blink-features=AutomationControlled"]
+
+# Max pages rendering at once
+MAX_PAGES = int(os.getenv("BROWSER_MAX_PAGES", "4"))
+
+CONTEXT_OPTIONS = {
+    "extra_http_headers": {"Accept-Language": "en-US,en;q=0.9"}
+}
+
+# --------------------------------------------------
+# Shared state (one Chromium per process)
+# --------------------------------------------------
+
+_playwright: Optional[Playwright] = None
+_browser: Optional[Browser] = None
+
+_launch_lock = asyncio.Lock()
+_page_slots = asyncio.Semaphore(MAX_PAGES)
+
+
+async def _ensure_browser() -> Browser:
+    """
+    Launch on first use, relaunch if Chromium died.
+    The lock makes concurrent callers share a single launch.
+    """
+    global _playwright, _browser
+
+    if _browser is not None and _browser.is_connected():
+        return _browser
+
+    async with _launch_lock:
+        if _browser is not None and _browser.is_connected():
+            return _browser
+
+        if _playwright is None:
+            _playwright = await async_playwright().start()
+
+        _browser = await _playwright.chromium.launch(
+            headless=True,
+            args=BROWSER_ARGS
+        )
+        logger.info("🌐 Chromium launched")
+
+        return _browser
+
+
+# --------------------------------------------------
+# Acquire / release
+# --------------------------------------------------
+
+async def acquire() -> Page:
+    """
+    Page in a fresh context (no cookies / storage from earlier renders);
+    waits while MAX_PAGES are in use.
+    Every acquire() must be paired with release().
+    """
+    await _page_slots.acquire()
+
+    try:
+        browser = await _ensure_browser()
+        context = await browser.new_context(**CONTEXT_OPTIONS)
+
+        try:
+            return await context.new_page()
+        except BaseException:
+            await context.close()
+            raise
+
+    except BaseException:
+        _page_slots.release()
+        raise
+
+
+async def release(page: Page) -> None:
+    try:
+        # closing the context drops its pages, cookies and storage
+        await page.context.close()
+
+    except Exception:
+        logger.debug("Context already closed", exc_info=True)
+
+    finally:
+        _page_slots.release()
+
+
+@asynccontextmanager
+async def pooled_page() -> AsyncIterator[Page]:
+    page = await acquire()
+    try:
+        yield page
+    finally:
+        await release(page)
+
+
+# --------------------------------------------------
+# Shutdown
+# --------------------------------------------------
+
+async def close_pool() -> None:
+    """
+    Close browser and driver (FastAPI shutdown hook).
+    """
+    global _playwright, _browser
+
+    async with _launch_lock:
+        if _browser is not None:
+            await _browser.close()
+            _browser = None
+
+        if _playwright is not None:
+            await _playwright.stop()
+            _playwright = None
+            logger.info("Chromium closed")
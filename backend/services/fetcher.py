@@ -1,20 +1,47 @@
 import asyncio
+import heapq
 import logging
 import re
-import json
-from collections import Counter
+import time
+from collections import Counter, OrderedDict
+from operator import itemgetter
 from urllib.parse import urlparse
 import os
 
-import requests
-from bs4 import BeautifulSoup
-from playwright.sync_api import sync_playwright
-from playwright_stealth import Stealth
+import httpx
+from bs4 import BeautifulSoup, SoupStrainer
+
+from backend.utils.html import HTML_PARSER, parse_html, visible_text
+from backend.extractors.jsonld_extractor import JSONLDExtractor, is_ld_json
+from backend.services.playwright_worker import render_page
 
 MAX_HTML_SIZE = 50_000_000
 MIN_VISIBLE_TEXT = 300
 REQUEST_TIMEOUT = 20
 
+# Recently extracted pages, keyed by URL. The UI re-submits the same URLs
+# on every rerun; a hit skips both the fetch and the parse. Per process —
+# each worker keeps its own.
+PAGE_CACHE_TTL = 300  # seconds
+PAGE_CACHE_SIZE = int(os.getenv("PAGE_CACHE_SIZE", "32"))
+# Also bounded by bytes (html + visible text): a single page may be up to
+# MAX_HTML_SIZE, and pages larger than the whole budget are not cached.
+PAGE_CACHE_MAX_BYTES = int(os.getenv("PAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Capitalized words used as a cheap named-entity guess
+_NAME_RE = re.compile(r"\b[A-Z][a-zA-Z]{2,}\b")
+TOP_NAMED_ENTITIES = 10
+
+# capitalized but never a name: sentence starters, months, weekdays
+_NAME_STOPWORDS = frozenset({
+    "The", "And", "For", "With", "You", "Your", "Our", "This", "That",
+    "Are", "Not", "All", "Get", "New", "More",
+    "January", "February", "March", "April", "May", "June", "July",
+    "August", "September", "October", "November", "December",
+    "Monday", "Tuesday", "Wednesday", "Thursday", "Friday",
+    "Saturday", "Sunday",
+})
+
 HEADERS = {
     "User-Agent": (
         "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
@@ -30,38 +57,108 @@ HEADERS = {
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# the only tags extract_metadata reads
+_META_STRAINER = SoupStrainer(["title", "meta", "script"])
+
+# above this, raw-HTML metadata is read by a streaming pass, no tree
+STREAM_METADATA_THRESHOLD = 1_000_000
+_STREAM_CHUNK = 64 * 1024
+
 def clean_html(html: str) -> BeautifulSoup:
-    soup = BeautifulSoup(html, "html.parser")
+    soup = parse_html(html)
     for tag in soup(["script", "style", "noscript"]):
         tag.decompose()
     return soup
 
 
-def extract_visible_text(html: str) -> str:
-    soup = clean_html(html)
-    text = soup.get_text(separator=" ", strip=True)
-    text = re.sub(r"\s+", " ", text)
-    return text
+def _as_soup(page: str | BeautifulSoup) -> BeautifulSoup:
+    if isinstance(page, BeautifulSoup):
+        return page
+    return parse_html(page)
 
 
-def extract_metadata(html: str) -> dict:
-    soup = BeautifulSoup(html, "html.parser")
+def extract_visible_text(page: str | BeautifulSoup) -> str:
+    # non-mutating: a shared soup stays intact for the extractors
+    text = visible_text(_as_soup(page))
+    # whitespace collapse; split/join beats re.sub on multi-MB text
+    return " ".join(text.split())
+
+
+def extract_metadata(
+    page: str | BeautifulSoup,
+    json_ld: list | None = None
+) -> dict:
+    """
+    `json_ld`: blocks from JSONLDExtractor.parse_blocks when the caller
+    already parsed them (extract_page) — they are not parsed twice.
+    Raw HTML is parsed through _META_STRAINER (partial tree only).
+    """
+    if isinstance(page, BeautifulSoup):
+        soup = page
+    elif len(page) > STREAM_METADATA_THRESHOLD and HTML_PARSER == "lxml":
+        return _stream_metadata(page)
+    else:
+        soup = parse_html(page, parse_only=_META_STRAINER)
 
     title = soup.title.string.strip() if soup.title else None
 
     meta_desc = soup.find("meta", attrs={"name": "description"})
     meta_desc = meta_desc.get("content").strip() if meta_desc else None
 
+    if json_ld is None:
+        json_ld = JSONLDExtractor.parse_blocks(soup)
+
+    return {
+        "title": title,
+        "meta_description": meta_desc,
+        "json_ld_count": len(json_ld),
+        "json_ld": json_ld
+    }
+
+
+def _stream_metadata(html: str) -> dict:
+    """
+    extract_metadata for very large raw HTML: lxml pull parser, every
+    element cleared as soon as it closes, so only the open path is live.
+    """
+    from lxml import etree
+
+    title = None
+    meta_desc = None
     json_ld = []
 
-    for script in soup.find_all("script"):
-        t = script.get("type", "")
-        if "ld+json" in t.lower():
-            try:
-                if script.string:
-                    json_ld.append(json.loads(script.string))
-            except Exception:
-                continue
+    parser = etree.HTMLPullParser(events=("end",))
+
+    def consume():
+        nonlocal title, meta_desc
+
+        for _, elem in parser.read_events():
+            tag = elem.tag
+
+            if tag == "title" and title is None:
+                title = (elem.text or "").strip()
+
+            elif tag == "meta" and meta_desc is None:
+                if elem.get("name") == "description":
+                    meta_desc = (elem.get("content") or "").strip()
+
+            elif tag == "script" and elem.text and is_ld_json(elem.get("type")):
+                try:
+                    json_ld.append(JSONLDExtractor.loads(elem.text))
+                except Exception as e:
+                    logger.debug(f"JSON-LD parse error ignored: {e}")
+
+            # drop the finished subtree and everything before it
+            elem.clear(keep_tail=True)
+            while elem.getprevious() is not None:
+                del elem.getparent()[0]
+
+    for i in range(0, len(html), _STREAM_CHUNK):
+        parser.feed(html[i:i + _STREAM_CHUNK])
+        consume()
+
+    parser.close()
+    consume()
 
     return {
         "title": title,
@@ -75,20 +172,111 @@ def is_js_shell(text: str) -> bool:
     return len(text) < MIN_VISIBLE_TEXT
 
 
+# empty SPA mount points: the server sent a shell, content needs JS
+_SHELL_MOUNTS = (
+    'id="root"></div>',
+    'id="app"></div>',
+    'id="__next"></div>',
+    'id="__nuxt"></div>',
+)
+_SHELL_WINDOW = 256_000
+
+
+def looks_like_js_shell(html: str) -> bool:
+    """
+    Pre-parse check on raw HTML: substring scans over the head only.
+    """
+    head = html[:_SHELL_WINDOW].lower().replace("'", '"')
+    return any(m in head for m in _SHELL_MOUNTS)
+
+
 SCRAPER_API_KEY = os.getenv("SCRAPER_API_KEY")
+SCRAPER_API_URL = "http://api.scraperapi.com"
+
+# transient upstream errors are retried with exponential backoff
+FETCH_RETRIES = 2
+RETRY_BACKOFF = 0.3
+RETRY_STATUSES = frozenset({502, 503, 504})
+
+# --------------------------------------------------
+# Shared HTTP client (keep-alive pool, created on first fetch)
+# --------------------------------------------------
+
+_http_client: httpx.AsyncClient | None = None
+
+
+def _get_http_client() -> httpx.AsyncClient:
+    global _http_client
+
+    if _http_client is None or _http_client.is_closed:
+        # Accept-Encoding is left to httpx: gzip/deflate always, br once
+        # brotli is installed, so only decodable encodings are advertised.
+        # aiter_bytes yields decoded bytes: MAX_HTML_SIZE caps the
+        # decompressed page.
+        _http_client = httpx.AsyncClient(
+            # transport-level retries cover connect errors only
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                retries=FETCH_RETRIES,
+                limits=httpx.Limits(
+                    max_connections=64,
+                    max_keepalive_connections=32
+                )
+            ),
+            timeout=REQUEST_TIMEOUT,
+            follow_redirects=True
+        )
+
+    return _http_client
 
-def fetch_static(url: str) -> str | None:
+
+async def close_http_client() -> None:
+    global _http_client
+
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
+
+
+def _decode(body: bytes, encoding: str | None) -> str:
     try:
-        proxy_url = "http://api.scraperapi.com"
+        return body.decode(encoding or "utf-8", errors="replace")
+    except LookupError:
+        # bogus charset in Content-Type
+        return body.decode("utf-8", errors="replace")
+
 
+async def fetch_static(url: str) -> str | None:
+    try:
         params = {
             "api_key": SCRAPER_API_KEY,
             "url": url,
         }
 
-        r = requests.get(proxy_url, params=params, timeout=20)
-        r.raise_for_status()
-        return r.text
+        client = _get_http_client()
+
+        for attempt in range(FETCH_RETRIES + 1):
+
+            # stop reading at the cap: oversized pages are never fully
+            # buffered or decoded
+            async with client.stream("GET", SCRAPER_API_URL, params=params) as r:
+
+                status = r.status_code
+
+                if status not in RETRY_STATUSES or attempt == FETCH_RETRIES:
+                    r.raise_for_status()
+
+                    body = bytearray()
+                    async for chunk in r.aiter_bytes(64 * 1024):
+                        body += chunk
+                        if len(body) >= MAX_HTML_SIZE:
+                            break
+
+                    return _decode(body[:MAX_HTML_SIZE], r.encoding)
+
+            # connection released before backing off
+            logger.info(f"Retrying {url} after HTTP {status}")
+            await asyncio.sleep(RETRY_BACKOFF * 2 ** attempt)
 
     except Exception as e:
         logger.warning(f"ScraperAPI fetch failed: {e}")
@@ -140,15 +328,21 @@ def fetch_dynamic_sync(url: str) -> str:
 
 
 def extract_entities(text: str, metadata: dict, url: str) -> dict:
-    words = re.findall(r"\b[A-Z][a-zA-Z]{2,}\b", text)
-    freq = Counter(words)
+    # findall + Counter count in C; only the top-k selection is a heap
+    freq = Counter(_NAME_RE.findall(text))
+
+    # dropped after counting: a few pops instead of a check per match
+    for word in _NAME_STOPWORDS:
+        freq.pop(word, None)
+
+    top = heapq.nlargest(TOP_NAMED_ENTITIES, freq.items(), key=itemgetter(1))
 
     domain = urlparse(url).netloc.replace("www.", "")
     brand_guess = domain.split(".")[0].capitalize()
 
     entities = {
         "brand": metadata.get("title", "").split("|")[0].strip() if metadata.get("title") else brand_guess,
-        "top_named_entities": [w for w, _ in freq.most_common(10)]
+        "top_named_entities": [w for w, _ in top]
     }
 
     return entities
@@ -227,10 +421,108 @@ def extract_entities(text: str, metadata: dict, url: str) -> dict:
 
 '''
 
-async def extract_page(url: str) -> dict:
+async def fetch_dynamic(url: str) -> str | None:
+    """
+    Render on the shared Chromium (no per-request launch, no thread hop).
+    """
+    try:
+        html = await render_page(url)
+        return html[:MAX_HTML_SIZE]
+    except Exception as e:
+        logger.warning(f"Dynamic fetch failed: {e}")
+        return None
+
+
+# --------------------------------------------------
+# PAGE CACHE (LRU + TTL)
+# --------------------------------------------------
+
+_page_cache: "OrderedDict[str, tuple[float, int, dict]]" = OrderedDict()
+_page_cache_bytes = 0
+
+
+def _evict_page(url: str) -> None:
+    global _page_cache_bytes
+
+    _, size, _ = _page_cache.pop(url)
+    _page_cache_bytes -= size
+
+
+def _cached_page(url: str) -> dict | None:
+    hit = _page_cache.get(url)
+
+    if hit is None:
+        return None
+
+    stored_at, _, page = hit
+
+    if time.monotonic() - stored_at > PAGE_CACHE_TTL:
+        _evict_page(url)
+        return None
+
+    _page_cache.move_to_end(url)
+
+    # shallow copy: callers may add keys without touching the cache
+    return dict(page)
+
+
+def _store_page(url: str, page: dict) -> None:
+    global _page_cache_bytes
+
+    if PAGE_CACHE_SIZE <= 0:
+        return
+
+    size = len(page["html"]) + len(page.get("visible_text", ""))
+
+    if size > PAGE_CACHE_MAX_BYTES:
+        return
+
+    if url in _page_cache:
+        _evict_page(url)
+
+    # never the soup: a parse tree is many times the HTML size, and only
+    # the request that parsed it can use it
+    _page_cache[url] = (
+        time.monotonic(),
+        size,
+        {k: v for k, v in page.items() if k != "soup"}
+    )
+    _page_cache_bytes += size
+
+    while (
+        len(_page_cache) > PAGE_CACHE_SIZE
+        or _page_cache_bytes > PAGE_CACHE_MAX_BYTES
+    ):
+        _evict_page(next(iter(_page_cache)))
+
+
+async def extract_page(
+    url: str,
+    keep_soup: bool = False,
+    digest: bool = True
+) -> dict:
+    """
+    `keep_soup`: return the parsed tree as page["soup"] for in-process
+    analysis; it is dropped otherwise and never cached.
+    `digest=False`: only url / html / fetch_mode, no parse at all (the
+    caller parses elsewhere, e.g. in an analysis worker process).
+    """
+    cached = _cached_page(url)
+
+    # an html-only entry does not satisfy a digest caller
+    if cached is not None and (not digest or "entities" in cached):
+        logger.info(f"♻️ Page cache hit: {url}")
+        return cached
+
     logger.info(f"Fetching via ScraperAPI: {url}")
 
-    html = fetch_static(url)
+    html = await fetch_static(url)
+    fetch_mode = "scraperapi"
+
+    if not html:
+        logger.info("⚠️ Falling back to dynamic rendering")
+        html = await fetch_dynamic(url)
+        fetch_mode = "dynamic"
 
     if not html:
         logger.error("❌ Failed to fetch page")
@@ -244,21 +536,86 @@ async def extract_page(url: str) -> dict:
             "entities": {}
         }
 
-    text = extract_visible_text(html)
-    metadata = extract_metadata(html)
+    page = await _digest(html, url) if digest else None
+
+    # the cheap marker scan gates the text check; SSR pages keep an
+    # (empty-looking) mount point but already carry their content
+    if fetch_mode == "scraperapi" and looks_like_js_shell(html):
+        static_text = await _visible_text(html, page)
+
+        if is_js_shell(static_text):
+            logger.info("⚠️ JS shell detected → dynamic rendering")
+            rendered = await fetch_dynamic(url)
+
+            if rendered:
+                rendered_page = await _digest(rendered, url) if digest else None
+                rendered_text = await _visible_text(rendered, rendered_page)
+
+                # a bot wall renders too: only keep the render if it has more text
+                if len(rendered_text) > len(static_text):
+                    html, page = rendered, rendered_page
+                    fetch_mode = "dynamic"
+
+    if page is None:
+        page = {"url": url, "html": html}
+
+    page["fetch_mode"] = fetch_mode
+
+    # failures above return early, so they are retried next time
+    _store_page(url, page)
+
+    if not keep_soup:
+        page.pop("soup", None)
 
-    logger.info(
-        f"[SCRAPERAPI] text={len(text)} "
-        f"jsonld={metadata.get('json_ld_count')} "
-        f"html_size={len(html)}"
+    if digest:
+        logger.info(
+            f"[{fetch_mode.upper()}] text={page['text_length']} "
+            f"jsonld={page['metadata'].get('json_ld_count')} "
+            f"html_size={len(html)}"
+        )
+    else:
+        logger.info(f"[{fetch_mode.upper()}] html_size={len(html)}")
+
+    return page
+
+
+async def _digest(html: str, url: str) -> dict:
+    # parsing is CPU-bound; keep it off the event loop so other
+    # requests keep fetching meanwhile
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(None, _digest_page, html, url)
+
+
+async def _visible_text(html: str, page: dict | None) -> str:
+    """
+    Visible text of `html`, reusing its digest when there is one.
+    """
+    if page is not None:
+        return page["visible_text"]
+
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        None, lambda: extract_visible_text(parse_html(html))
     )
 
+
+def _digest_page(html: str, url: str) -> dict:
+    """
+    Parse once; text, metadata and analyze_html all share this tree.
+    The steps stay sequential: they are pure-Python tree walks, so
+    splitting them across threads only contends for the GIL.
+    """
+    soup = parse_html(html)
+
+    text = extract_visible_text(soup)
+    metadata = extract_metadata(soup, JSONLDExtractor.parse_blocks(soup))
+
     entities = extract_entities(text, metadata, url)
 
     return {
         "url": url,
-        "fetch_mode": "scraperapi",
         "html": html,
+        "soup": soup,
         "text_length": len(text),
         "visible_text": text,
         "metadata": metadata,
@@ -1,25 +1,31 @@
-from playwright.sync_api import sync_playwright
+from playwright.async_api import TimeoutError as PlaywrightTimeoutError
 
-def render_page(url: str) -> str:
-    with sync_playwright() as p:
-        browser = p.chromium.launch(
-            headless=True,
-            args=["--disable-blink-features=AutomationControlled"]
-        )
+from backend.services.browser_pool import pooled_page
 
-        page = browser.new_page()
-        page.set_extra_http_headers({
-            "Accept-Language": "en-US,en;q=0.9"
-        })
+# upper bound for hydration; never a fixed sleep
+SETTLE_TIMEOUT_MS = 5000
+
+# rendered enough to analyze: structured data or real body text
+HYDRATED_JS = """() =>
+    document.querySelector('script[type="application/ld+json"]') !== null
+    || (document.body !== null && document.body.innerText.length > 300)
+"""
+
+
+async def render_page(url: str) -> str:
+    async with pooled_page() as page:
 
         # IMPORTANT: avoid networkidle
-        page.goto(url, wait_until="domcontentloaded", timeout=60000)
+        await page.goto(url, wait_until="domcontentloaded", timeout=60000)
 
         # Wait for DOM + SPA hydration
-        page.wait_for_selector("body", timeout=15000)
-        page.wait_for_timeout(3000)
+        await page.wait_for_selector("body", timeout=15000)
 
-        html = page.content()
-        browser.close()
+        # returns as soon as the page has content; partial hydration
+        # after the timeout is still rendered and analyzed
+        try:
+            await page.wait_for_function(HYDRATED_JS, timeout=SETTLE_TIMEOUT_MS)
+        except PlaywrightTimeoutError:
+            pass
 
-        return html
+        return await page.content()
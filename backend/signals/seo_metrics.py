@@ -1,38 +1,74 @@
 import re
 import logging
+from itertools import islice
 from typing import Dict
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 
 logger = logging.getLogger(__name__)
 
+# compiled once; character class instead of a single-char alternation
+_PRICE_RE = re.compile(r"[₹$€]\s?\d+")
+_PHONE_RE = re.compile(r"\b\+?\d[\d\s\-]{8,20}\b")
+
+# joins text nodes; outside _PHONE_RE's class, so matches never span nodes
+_NODE_SEP = "\x00"
+
+# Marker / price scans only look at the head of the document: the
+# markers sit in the first few hundred KB of real pages, while a page can
+# be up to MAX_HTML_SIZE (50MB) — lowering and scanning all of it is the
+# analyzer's biggest memory pass. Tree-based signals still see everything.
+_SIGNAL_WINDOW = 512_000
+
+# Substring markers. Plain `in` (fast C substring search) beats a compiled
+# alternation ~7x on multi-MB HTML, so keep them as literals; entries
+# implied by a shorter one ("reviews" by "review") are left out.
+_YOUTUBE_MARKERS = ("youtube.com", "youtu.be", "youtube-nocookie.com")
+_CART_MARKERS = ("add to cart", "buy now", "add-to-cart")
+_REVIEW_MARKERS = ("review", "rating", "stars")
+
 
 class SEOMetricsAnalyzer:
     """
     SEO Signals Analyzer (Layer-2)
     Produces strong, evidence-based signals for schema suggestions.
     NO entity extraction here.
+
+    Works on its own lexbor (C) tree: every lookup here is a plain tag
+    query, so bs4's per-node Python objects would be pure overhead.
     """
 
-    def analyze(self, html: str, soup: BeautifulSoup) -> Dict:
+    def analyze(self, html: str) -> Dict:
+        tree = LexborHTMLParser(html)
+
+        # lowered once for every substring / regex signal below
+        html_lower = html[:_SIGNAL_WINDOW].lower()
+
+        meta = self._meta_signals(tree)
+
+        # everything below sees the page without script / style / noscript
+        tree.strip_tags(["script", "style", "noscript"])
+
         return {
-            "meta": self._meta_signals(soup),
-            "content": self._content_signals(soup),
-            "media": self._media_signals(html, soup),
-            "ecommerce": self._ecommerce_signals(html),
-            "local": self._local_signals(soup),
-            "structured_data_hints": self._structured_data_hints(html),
+            "meta": meta,
+            "content": self._content_signals(tree),
+            "media": self._media_signals(html_lower, tree),
+            "ecommerce": self._ecommerce_signals(html_lower),
+            "local": self._local_signals(tree),
+            "structured_data_hints": self._structured_data_hints(html_lower),
         }
 
     # --------------------------------------------------
     # META SIGNALS
     # --------------------------------------------------
 
-    def _meta_signals(self, soup: BeautifulSoup) -> Dict:
-        title = soup.find("title")
-        description = soup.find("meta", attrs={"name": "description"})
+    def _meta_signals(self, tree: LexborHTMLParser) -> Dict:
+        title = tree.css_first("title")
+        description = tree.css_first('meta[name="description"]')
 
-        title_text = title.get_text(strip=True) if title else ""
-        desc_text = description.get("content", "") if description else ""
+        title_text = title.text(strip=True) if title else ""
+        desc_text = (
+            description.attributes.get("content") or ""
+        ) if description else ""
 
         return {
             "title_present": bool(title_text),
@@ -45,11 +81,8 @@ class SEOMetricsAnalyzer:
     # CONTENT SIGNALS
     # --------------------------------------------------
 
-    def _content_signals(self, soup: BeautifulSoup) -> Dict:
-        for tag in soup(["script", "style", "noscript"]):
-            tag.decompose()
-
-        text = soup.get_text(separator=" ", strip=True)
+    def _content_signals(self, tree: LexborHTMLParser) -> Dict:
+        text = tree.root.text(separator=" ", strip=True) if tree.root else ""
         text_lower = text.lower()
         word_count = len(text.split())
 
@@ -62,24 +95,20 @@ class SEOMetricsAnalyzer:
             "word_count": word_count,
             "long_form_content": word_count >= 600,
             "very_long_content": word_count >= 1200,
-            "multiple_h1": len(soup.find_all("h1")) > 1,
+            "multiple_h1": len(tree.css("h1")) > 1,
             "faq_like_content": faq_like,
-            "navigation_detected": bool(soup.find("nav")),
+            "navigation_detected": tree.css_first("nav") is not None,
         }
 
     # --------------------------------------------------
     # MEDIA SIGNALS
     # --------------------------------------------------
 
-    def _media_signals(self, html: str, soup: BeautifulSoup) -> Dict:
-        html_lower = html.lower()
-        images = soup.find_all("img")
+    def _media_signals(self, html_lower: str, tree: LexborHTMLParser) -> Dict:
+        images = tree.css("img")
 
         return {
-            "youtube_embedded": any(
-                d in html_lower
-                for d in ("youtube.com", "youtu.be", "youtube-nocookie.com")
-            ),
+            "youtube_embedded": any(d in html_lower for d in _YOUTUBE_MARKERS),
             "image_rich": len(images) >= 5,
         }
 
@@ -87,32 +116,27 @@ class SEOMetricsAnalyzer:
     # ECOMMERCE SIGNALS
     # --------------------------------------------------
 
-    def _ecommerce_signals(self, html: str) -> Dict:
-        html_lower = html.lower()
-        price_pattern = re.compile(r"(₹|\$|€)\s?\d+")
+    def _ecommerce_signals(self, html_lower: str) -> Dict:
+        # one scan, stops at the second price
+        prices = list(islice(_PRICE_RE.finditer(html_lower), 2))
 
         return {
-            "product_detected": any(
-                k in html_lower
-                for k in ("add to cart", "buy now", "add-to-cart")
-            ),
-            "price_detected": bool(price_pattern.search(html_lower)),
-            "multi_price_detected": len(price_pattern.findall(html_lower)) > 1,
-            "review_detected": any(
-                k in html_lower
-                for k in ("review", "reviews", "rating", "ratings", "stars")
-            ),
+            "product_detected": any(k in html_lower for k in _CART_MARKERS),
+            "price_detected": bool(prices),
+            "multi_price_detected": len(prices) > 1,
+            "review_detected": any(k in html_lower for k in _REVIEW_MARKERS),
         }
 
     # --------------------------------------------------
     # LOCAL / BUSINESS SIGNALS
     # --------------------------------------------------
 
-    def _local_signals(self, soup: BeautifulSoup) -> Dict:
-        address = soup.find("address")
+    def _local_signals(self, tree: LexborHTMLParser) -> Dict:
+        address = tree.css_first("address")
 
-        phone_present = bool(
-            soup.find(string=re.compile(r"\+?\d[\d\s\-]{8,}"))
+        # one C-level join + one regex scan instead of a per-node walk
+        phone_present = tree.root is not None and bool(
+            _PHONE_RE.search(tree.root.text(separator=_NODE_SEP, strip=False))
         )
 
         return {
@@ -124,9 +148,7 @@ class SEOMetricsAnalyzer:
     # STRUCTURED DATA HINTS
     # --------------------------------------------------
 
-    def _structured_data_hints(self, html: str) -> Dict:
-        html_lower = html.lower()
-
+    def _structured_data_hints(self, html_lower: str) -> Dict:
         return {
             "json_ld_present": "application/ld+json" in html_lower,
             "microdata_present": "itemscope" in html_lower,
@@ -1,10 +1,20 @@
 import logging
-from bs4 import BeautifulSoup
+from typing import Optional
+
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
 
 logger = logging.getLogger(__name__)
 
 MAX_HTML_SIZE = 5_000_000  
 
+# lxml's C parser is several times faster than html.parser on large pages;
+# html.parser stays as the fallback when lxml isn't installed
+try:
+    import lxml  # noqa: F401
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
 
 def validate_html(html: str) -> str:
     """
@@ -21,6 +31,22 @@ def validate_html(html: str) -> str:
     return html
 
 
+def parse_html(
+    html: str,
+    parse_only: Optional[SoupStrainer] = None
+) -> BeautifulSoup:
+    """
+    Single construction point for every soup in the backend.
+    Falls back to html.parser if bs4 can't find the lxml builder.
+    `parse_only` builds just the matching tags (partial tree).
+    """
+    try:
+        return BeautifulSoup(html, HTML_PARSER, parse_only=parse_only)
+    except FeatureNotFound:
+        logger.warning("lxml builder unavailable, using html.parser")
+        return BeautifulSoup(html, "html.parser", parse_only=parse_only)
+
+
 def make_soup(html: str) -> BeautifulSoup:
     """
     Create BeautifulSoup object safely
@@ -28,7 +54,7 @@ def make_soup(html: str) -> BeautifulSoup:
     html = validate_html(html)
 
     try:
-        soup = BeautifulSoup(html, "html.parser")
+        soup = parse_html(html)
         return soup
     except Exception as e:
         logger.error(f"BeautifulSoup parse failed: {e}")
@@ -43,3 +69,18 @@ def extract_visible_text(soup: BeautifulSoup) -> str:
         tag.decompose()
 
     return soup.get_text(separator=" ", strip=True)
+
+
+def visible_text(soup: BeautifulSoup) -> str:
+    """
+    Same text as extract_visible_text, without mutating the tree,
+    so one soup can still be handed to the extractors afterwards.
+    (bs4 already leaves script / style strings out of .strings.)
+    """
+    return " ".join(
+        text
+        for s in soup.strings
+        if not any(p.name == "noscript" for p in s.parents)
+        for text in (s.strip(),)
+        if text
+    )
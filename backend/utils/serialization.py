@@ -0,0 +1,68 @@
+from typing import Any, Tuple
+
+import orjson
+
+_OPTS = orjson.OPT_NON_STR_KEYS
+
+
+def dumps_truncated(obj: Any, max_bytes: int) -> str:
+    """
+    Compact JSON for LLM prompts, at most `max_bytes`.
+    Always valid JSON: whole keys / items are dropped, never cut mid-value.
+    """
+    return orjson.dumps(truncate_for_prompt(obj, max_bytes), option=_OPTS).decode()
+
+
+def truncate_for_prompt(obj: Any, max_bytes: int) -> Any:
+    """
+    Keep leading dict keys / list items while the serialized size fits.
+    Only the kept part of the structure is ever serialized.
+    """
+    truncated, size = _truncate(obj, max_bytes)
+    return truncated if size <= max_bytes else None
+
+
+def _truncate(obj: Any, budget: int) -> Tuple[Any, int]:
+
+    if isinstance(obj, dict):
+        out = {}
+        used = 2  # {}
+
+        for key, value in obj.items():
+            sep = 1 if out else 0
+            key_size = len(orjson.dumps(str(key))) + 1  # "key":
+            remaining = budget - used - sep - key_size
+
+            if remaining <= 0:
+                break
+
+            value, size = _truncate(value, remaining)
+            if size > remaining:
+                break
+
+            out[key] = value
+            used += sep + key_size + size
+
+        return out, used
+
+    if isinstance(obj, (list, tuple)):
+        out_list = []
+        used = 2  # []
+
+        for item in obj:
+            sep = 1 if out_list else 0
+            remaining = budget - used - sep
+
+            if remaining <= 0:
+                break
+
+            item, size = _truncate(item, remaining)
+            if size > remaining:
+                break
+
+            out_list.append(item)
+            used += sep + size
+
+        return out_list, used
+
+    return obj, len(orjson.dumps(obj, option=_OPTS))
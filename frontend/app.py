@@ -1,7 +1,11 @@
 import streamlit as st
-import requests,json
+import httpx
+import orjson
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 import pandas as pd
+import xlsxwriter
 from io import BytesIO
 from dotenv import load_dotenv
 
@@ -15,6 +19,10 @@ BACKEND_URL = os.getenv("BACKEND_URL", "http://localhost:8000")
 
 API_ANALYZE = f"{BACKEND_URL}/api/analyze"
 API_SCHEMA = f"{BACKEND_URL}/api/generate-schema"
+API_SCHEMA_BATCH = f"{BACKEND_URL}/api/generate-schema/batch"
+
+# parallel schema requests for "Generate all"
+SCHEMA_WORKERS = 8
 
 st.set_page_config(
     page_title="Entity Validator and Schema Generator",
@@ -27,9 +35,14 @@ st.set_page_config(
 
 defaults = {
     "urls": [],
+    "url_seed": [],
+    "url_editor_version": 0,
     "htmls": [],
     "results": {},
-    "schemas": {}
+    "schemas": {},
+    "excel_bytes": None,
+    "source_counts": None,
+    "export_rows": None
 }
 
 for k, v in defaults.items():
@@ -40,8 +53,24 @@ for k, v in defaults.items():
 # API HELPERS
 # --------------------------------------------------
 
+# The script re-executes on every rerun, so a plain module-level client
+# would be rebuilt each time; cache_resource keeps one keep-alive pool
+# for the whole server process. httpx.Client is thread-safe (bulk schema
+# threads share it) and multiplexes over HTTP/2 on HTTPS backends.
+@st.cache_resource
+def get_http_client():
+    return httpx.Client(
+        http2=True,
+        timeout=httpx.Timeout(300.0, connect=10.0),
+        limits=httpx.Limits(
+            max_keepalive_connections=8,
+            max_connections=16
+        )
+    )
+
+
 def call_analyze_api(payload):
-    r = requests.post(API_ANALYZE, json=payload, timeout=300)
+    r = get_http_client().post(API_ANALYZE, json=payload)
 
     if r.status_code != 200:
         raise Exception(r.text)
@@ -49,22 +78,97 @@ def call_analyze_api(payload):
     return r.json()
 
 
+def _schema_payload(schema_name, entities, signals, url):
+    return {
+        "schema": schema_name,
+        "entities": entities,
+        "signals": signals,
+        "url": url
+    }
+
+
+def _post_schema(payload):
+    """
+    Thread-safe (no st.* calls): returns (schema, error_text).
+    """
+    try:
+        r = get_http_client().post(API_SCHEMA, json=payload)
+    except httpx.HTTPError as e:
+        return None, str(e)
+
+    if r.status_code != 200:
+        return None, r.text
+
+    return r.json(), None
+
+
 def generate_schema(schema_name, entities, signals, url):
 
+    schema, error = _post_schema(
+        _schema_payload(schema_name, entities, signals, url)
+    )
+
+    if error is not None:
+        st.error(f"Schema API Error:\n{error}")
+        return None
+
+    return schema
+
+
+def _post_schema_batch(names, entities, signals, url):
+    """
+    One request for all schemas of a page. None when the backend has no
+    batch endpoint (404), so the caller can fall back to per-item calls.
+    """
     payload = {
-        "schema": schema_name,
+        "schemas": names,
         "entities": entities,
         "signals": signals,
         "url": url
     }
 
-    r = requests.post(API_SCHEMA, json=payload, timeout=300)
+    try:
+        r = get_http_client().post(API_SCHEMA_BATCH, json=payload)
+    except httpx.HTTPError as e:
+        return [(None, str(e))] * len(names)
 
-    if r.status_code != 200:
-        st.error(f"Schema API Error:\n{r.text}")
+    if r.status_code == 404:
         return None
 
-    return r.json()
+    if r.status_code != 200:
+        return [(None, r.text)] * len(names)
+
+    return [(schema, None) for schema in r.json()["results"]]
+
+
+def generate_schemas_bulk(pending, entities, signals, url):
+    """
+    pending: [(key, schema_name)] -> {key: schema}; one batch request,
+    or parallel per-item requests against an older backend. Errors are
+    reported once all have finished.
+    """
+    names = [name for _, name in pending]
+
+    responses = _post_schema_batch(names, entities, signals, url)
+
+    if responses is None:
+        payloads = [
+            _schema_payload(name, entities, signals, url)
+            for name in names
+        ]
+
+        with ThreadPoolExecutor(max_workers=SCHEMA_WORKERS) as pool:
+            responses = list(pool.map(_post_schema, payloads))
+
+    schemas = {}
+
+    for (key, name), (schema, error) in zip(pending, responses):
+        if error is not None:
+            st.error(f"Schema API Error ({name}):\n{error}")
+        elif schema:
+            schemas[key] = schema
+
+    return schemas
 
 
 # --------------------------------------------------
@@ -83,122 +187,146 @@ def compute_source_counts(entities):
     return counts
 
 
-# --------------------------------------------------
-# EXCEL EXPORT (ENTERPRISE STYLE)
-# --------------------------------------------------
+def compute_all_source_counts(results_map):
+    """
+    {url: counts} for every page in one pass; run once per audit.
+    Plain loops: for a few thousand items a DataFrame groupby costs
+    ~10x more in setup than it saves.
+    """
+    return {
+        url: compute_source_counts(page.get("entities", {}))
+        for url, page in results_map.items()
+    }
 
-def build_excel(results_map):
 
-    output = BytesIO()
+def flatten_results(results_map, source_counts):
+    """
+    One walk over the results -> (summary_rows, entity_rows,
+    suggestion_rows). Run once per audit; the export only reads them.
+    """
+    summary_rows = []
+    entity_rows = []
+    suggestion_rows = []
 
-    with pd.ExcelWriter(output, engine="xlsxwriter") as writer:
+    for url, page in results_map.items():
 
-        workbook = writer.book
+        counts = source_counts[url]
 
-        header = workbook.add_format({
-            "bold": True,
-            "border": 1,
-            "align": "center",
-            "fg_color": "#E7F3FF"
+        summary_rows.append({
+            "URL": url,
+            "Total Entities": page.get("total_entities", 0),
+            "JSON-LD": counts["jsonld"],
+            "Microdata": counts["microdata"],
+            "RDFa": counts["rdfa"]
         })
 
-        # ---------- SUMMARY ----------
-        summary_rows = []
-
-        for url, page in results_map.items():
-
-            entities = page.get("entities", {})
-            counts = compute_source_counts(entities)
-
-            summary_rows.append({
-                "URL": url,
-                "Total Entities": page.get("total_entities", 0),
-                "JSON-LD": counts["jsonld"],
-                "Microdata": counts["microdata"],
-                "RDFa": counts["rdfa"]
-            })
-
-        df_summary = pd.DataFrame(summary_rows)
-        df_summary.to_excel(
-            excel_writer=writer,
-            sheet_name="Entities Count",
-            index=False
-        )
+        for schema, block in page.get("entities", {}).items():
 
-        sheet = writer.sheets["Entities Count"]
+            for item in block.get("items", []):
 
-        for col, name in enumerate(df_summary.columns):
-            sheet.write(0, col, name, header)
-            sheet.set_column(col, col, 30)
+                name = item.get("properties", {}).get("name", "")
+                source = item.get("source", "")
 
-        sheet.freeze_panes(1, 0)
+                # str() only for non-strings (list / dict names);
+                # xlsxwriter writes numeric confidences natively
+                entity_rows.append({
+                    "URL": url,
+                    "Schema": schema,
+                    "Name": name if isinstance(name, str) else str(name),
+                    "Source": source if isinstance(source, str) else str(source),
+                    "Confidence": item.get("confidence", 0)
+                })
 
-        # ---------- ENTITIES ----------
-        entity_rows = []
+        for category, items in page.get("suggestions", {}).items():
 
-        for url, page in results_map.items():
+            for s in items:
 
-            for schema, block in page.get("entities", {}).items():
+                suggestion_rows.append({
+                    "URL": url,
+                    "Schema": s.get("schema"),
+                    "Confidence": s.get("confidence"),
+                    "Category": category,
+                    "Reason": s.get("reason")
+                })
 
-                for item in block.get("items", []):
+    return summary_rows, entity_rows, suggestion_rows
 
-                    entity_rows.append({
-                        "URL": url,
-                        "Schema": schema,
-                        "Name": str(item.get("properties", {}).get("name", "")),
-                        "Source": str(item.get("source", "")),
-                        "Confidence": float(item.get("confidence", 0))
-                    })
 
-        df_entities = pd.DataFrame(entity_rows)
-        df_entities.to_excel(
-            excel_writer=writer,
-            sheet_name="Extracted Entities",
-            index=False
-        )
+# orjson: C encoder, UTF-8 bytes out (non-ASCII kept as-is)
+_JSON_OPTS = orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
 
-        sheet = writer.sheets["Extracted Entities"]
 
-        for col, name in enumerate(df_entities.columns):
-            sheet.write(0, col, name, header)
-            sheet.set_column(col, col, 32)
+def page_json(page):
+    return orjson.dumps(page, option=_JSON_OPTS)
 
-        sheet.freeze_panes(1, 0)
 
-        # ---------- SUGGESTIONS ----------
-        suggestion_rows = []
+def pretty_json(obj):
+    return orjson.dumps(obj, option=_JSON_OPTS).decode()
+
 
-        for url, page in results_map.items():
+# --------------------------------------------------
+# EXCEL EXPORT (ENTERPRISE STYLE)
+# --------------------------------------------------
 
-            for category, items in page.get("suggestions", {}).items():
+SUMMARY_COLUMNS = ("URL", "Total Entities", "JSON-LD", "Microdata", "RDFa")
+ENTITY_COLUMNS = ("URL", "Schema", "Name", "Source", "Confidence")
+SUGGESTION_COLUMNS = ("URL", "Schema", "Confidence", "Category", "Reason")
 
-                for s in items:
 
-                    suggestion_rows.append({
-                        "URL": url,
-                        "Schema": s.get("schema"),
-                        "Confidence": s.get("confidence"),
-                        "Category": category,
-                        "Reason": s.get("reason")
-                    })
+def _write_sheet(workbook, name, columns, rows, width, header):
+    """
+    Rows straight into xlsxwriter: no DataFrame in between.
+    """
+    sheet = workbook.add_worksheet(name)
 
-        df_suggestions = pd.DataFrame(suggestion_rows)
-        df_suggestions.to_excel(
-            excel_writer=writer,
-            sheet_name="Suggested Schemas",
-            index=False
-        )
+    for col, title in enumerate(columns):
+        sheet.write(0, col, title, header)
+        sheet.set_column(col, col, width)
+
+    for r, row in enumerate(rows, start=1):
+        sheet.write_row(r, 0, [row[key] for key in columns])
+
+    sheet.freeze_panes(1, 0)
+
+
+# reruns with unchanged results reuse the finished workbook
+@st.cache_data(show_spinner=False, max_entries=8)
+def build_excel(summary_rows, entity_rows, suggestion_rows):
+
+    output = BytesIO()
+
+    # constant_memory: each row is flushed once the next one starts, so
+    # peak memory stays flat however large the audit is. Requires rows in
+    # order and set_column before data, which _write_sheet guarantees.
+    with xlsxwriter.Workbook(output, {"constant_memory": True}) as workbook:
+
+        header = workbook.add_format({
+            "bold": True,
+            "border": 1,
+            "align": "center",
+            "fg_color": "#E7F3FF"
+        })
 
-        sheet = writer.sheets["Suggested Schemas"]
+        # ---------- SUMMARY ----------
+        _write_sheet(
+            workbook, "Entities Count",
+            SUMMARY_COLUMNS, summary_rows, 30, header
+        )
 
-        for col, name in enumerate(df_suggestions.columns):
-            sheet.write(0, col, name, header)
-            sheet.set_column(col, col, 36)
+        # ---------- ENTITIES ----------
+        _write_sheet(
+            workbook, "Extracted Entities",
+            ENTITY_COLUMNS, entity_rows, 32, header
+        )
 
-        sheet.freeze_panes(1, 0)
+        # ---------- SUGGESTIONS ----------
+        _write_sheet(
+            workbook, "Suggested Schemas",
+            SUGGESTION_COLUMNS, suggestion_rows, 36, header
+        )
 
-    output.seek(0)
-    return output
+    # bytes, not BytesIO: cached values must be immutable
+    return output.getvalue()
 
 
 # --------------------------------------------------
@@ -218,25 +346,48 @@ mode = st.radio("Choose Input", ["URL", "Raw HTML"], horizontal=True)
 
 if mode == "URL":
 
-    col1, col2 = st.columns([4, 1])
+    # rendered above the list, filled in once the list is read
+    add_area = st.container()
 
-    with col1:
-        new_url = st.text_input("Add URL")
+    # one editable grid instead of a row + ❌ button per URL; "Add"
+    # re-seeds it under a new key so stale edits are not replayed
+    edited = st.data_editor(
+        # str dtype: an empty list would otherwise become a float column
+        pd.DataFrame({"URL": pd.Series(st.session_state.url_seed, dtype=str)}),
+        num_rows="dynamic",
+        hide_index=True,
+        column_config={"URL": st.column_config.TextColumn("URL")},
+        key=f"url_editor_{st.session_state.url_editor_version}"
+    )
 
-    with col2:
-        st.write("")
-        if st.button("➕ Add", disabled=len(st.session_state.urls) >= 5):
-            if new_url and new_url not in st.session_state.urls:
-                st.session_state.urls.append(new_url)
+    urls = []
 
-    st.caption(f"URLs added: {len(st.session_state.urls)} / 5")
+    for u in edited["URL"].dropna():
+        u = u.strip()
+        if u and u not in urls:
+            urls.append(u)
 
-    for i, url in enumerate(st.session_state.urls):
-        c1, c2 = st.columns([9, 1])
-        c1.write(url)
+    st.session_state.urls = urls[:5]
+
+    with add_area:
+
+        col1, col2 = st.columns([4, 1])
+
+        with col1:
+            new_url = st.text_input("Add URL")
+
+        with col2:
+            st.write("")
+            if st.button("➕ Add", disabled=len(st.session_state.urls) >= 5):
+                if new_url and new_url not in st.session_state.urls:
+                    st.session_state.url_seed = st.session_state.urls + [new_url]
+                    st.session_state.url_editor_version += 1
+                    st.rerun()
 
-        if c2.button("❌", key=f"remove_url_{i}"):
-            st.session_state.urls.pop(i)
+        st.caption(f"URLs added: {len(st.session_state.urls)} / 5")
+
+        if len(urls) > 5:
+            st.warning("Only the first 5 URLs are audited.")
 
 else:
 
@@ -269,6 +420,9 @@ disabled = (
 if st.button("🚀 Run Audit", width="stretch", disabled=disabled):
 
     st.session_state.schemas = {}  # prevent stale schemas
+    st.session_state.excel_bytes = None  # export belongs to old results
+    st.session_state.source_counts = None
+    st.session_state.export_rows = None
 
     payload = {}
 
@@ -295,18 +449,28 @@ if st.button("🚀 Run Audit", width="stretch", disabled=disabled):
 # DISPLAY RESULTS
 # --------------------------------------------------
 
-for url, page in st.session_state.results.items():
+# once per result set, shared by the expanders and the Excel export
+if st.session_state.source_counts is None:
+    st.session_state.source_counts = compute_all_source_counts(
+        st.session_state.results
+    )
+    st.session_state.export_rows = flatten_results(
+        st.session_state.results,
+        st.session_state.source_counts
+    )
+
+# One fragment per page: its buttons (Generate Schema, downloads) rerun
+# only that page instead of every page plus the export block.
+@st.fragment
+def render_result(url, page, expanded):
 
-    with st.expander(
-        f"🔗 {url}",
-        expanded=len(st.session_state.results) == 1
-    ):
+    with st.expander(f"🔗 {url}", expanded=expanded):
 
         entities = page.get("entities", {})
         signals = page.get("signals", {})
         suggestions = page.get("suggestions", {})
 
-        counts = compute_source_counts(entities)
+        counts = st.session_state.source_counts[url]
 
         c1, c2, c3, c4 = st.columns(4)
 
@@ -334,6 +498,28 @@ for url, page in st.session_state.results.items():
                 st.caption("No suggestions.")
             else:
 
+                pending = []
+
+                for category, items in suggestions.items():
+                    for idx, s in enumerate(items):
+                        key = f"{url}_{category}_{s['schema']}_{idx}"
+                        if key not in st.session_state.schemas:
+                            pending.append((key, s["schema"]))
+
+                if pending and st.button(
+                    f"⚡ Generate all suggestions ({len(pending)})",
+                    key=f"{url}_generate_all"
+                ):
+                    with st.spinner("Generating schemas..."):
+                        generated = generate_schemas_bulk(
+                            pending, entities, signals, url
+                        )
+                        st.session_state.schemas.update(generated)
+
+                    # refresh the buttons; on failures keep the errors visible
+                    if len(generated) == len(pending):
+                        st.rerun()
+
                 for category, items in suggestions.items():
 
                     st.markdown(f"### {category}")
@@ -353,38 +539,43 @@ for url, page in st.session_state.results.items():
                                         st.session_state.schemas[key] = schema
 
                             if key in st.session_state.schemas:
-                                st.code(json.dumps(
-                                        st.session_state.schemas[key],
-                                        indent=2,
-                                        ensure_ascii=False
-                                    ),language="json"
+                                st.code(
+                                    pretty_json(st.session_state.schemas[key]),
+                                    language="json"
                                 )
 
 
         with st.expander("📦 Export Page Data"):
             st.download_button(
                 "Download Page JSON",
-                data=json.dumps(
-                    page,
-                    indent=2,
-                    ensure_ascii=False
-                ),
+                # serialized on click only, not on every rerun
+                data=partial(page_json, page),
                 file_name=f"audit_{url.replace('/','_')}.json",
                 mime="application/json"
             )
 
 
+for url, page in st.session_state.results.items():
+    render_result(url, page, len(st.session_state.results) == 1)
+
+
 # --------------------------------------------------
 # GLOBAL EXCEL
 # --------------------------------------------------
 
+# built on request only: other reruns never touch xlsxwriter
 if st.session_state.results:
 
-    excel = build_excel(st.session_state.results)
+    if st.button("📊 Prepare Excel export"):
+        with st.spinner("Building workbook..."):
+            st.session_state.excel_bytes = build_excel(
+                *st.session_state.export_rows
+            )
 
-    st.download_button(
-        "📊 Download Full Audit Excel",
-        data=excel,
-        file_name="entityscope_audit.xlsx",
-        mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
-    )
\ No newline at end of file
+    if st.session_state.excel_bytes:
+        st.download_button(
+            "📊 Download Full Audit Excel",
+            data=st.session_state.excel_bytes,
+            file_name="entityscope_audit.xlsx",
+            mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+        )
\ No newline at end of file